@@ -0,0 +1,5 @@
+"""Together family app.
+
+streamlit_app.py is only the entry point; each page lives in together.views
+and is imported the first time it is shown.
+"""
@@ -0,0 +1,139 @@
+"""Emergency alerts: fan-out to the family, delivery receipts and latency.
+
+Alerts skip the group-commit writer (db.write) and commit on their own
+transaction, so a send never waits behind a batch of likes. One statement
+creates a delivery row for every other member. Each open session's live
+tick (live.notifications) sees the alert event and reruns the page, and
+the banner stamps delivered_at the first time the alert is on screen.
+delivered_at - created_at is the send-to-display latency shown to the
+sender; members who were away get the alert on their next visit and count
+from then.
+"""
+import uuid
+
+import streamlit as st
+
+from together import db, live
+from together.session import local_time
+
+# Recent alerts listed with their delivery status
+ALERT_HISTORY = 5
+
+
+def alerts_topic(family_code):
+    # Published when an alert is sent to the family
+    return f"alerts:{family_code}"
+
+
+def receipts_topic(family_code):
+    # Published when a member sees or acknowledges an alert
+    return f"alert_receipts:{family_code}"
+
+
+def send(user, family_code, message):
+    # Returns the number of members the alert was delivered to
+    alert_id = str(uuid.uuid4())
+    with db.transaction() as conn:
+        conn.execute(
+            """INSERT INTO alerts (id, sender, message, created_at, family_code)
+               VALUES (?, ?, ?, ?, ?)""",
+            (alert_id, user['username'], message, db.now_ms(), family_code))
+        # Read the members here rather than from the roster cache, so someone
+        # who joined a moment ago is not missed
+        recipients = conn.execute(
+            """INSERT INTO alert_deliveries (alert_id, user_id)
+               SELECT ?, id FROM users WHERE family_code = ? AND id != ?""",
+            (alert_id, family_code, user['id'])).rowcount
+    live.publish(family_code, "alert", topic=alerts_topic(family_code),
+                 alert_id=alert_id, sender=user['id'],
+                 sender_name=user['username'])
+    return recipients
+
+
+def acknowledge(alert_id, user_id):
+    now = db.now_ms()
+    db.execute(
+        """UPDATE alert_deliveries
+           SET acknowledged_at = ?, delivered_at = COALESCE(delivered_at, ?)
+           WHERE alert_id = ? AND user_id = ?""",
+        (now, now, alert_id, user_id))
+    st.session_state.alert_cache = None
+    live.publish(st.session_state.family_code, "alert_receipt",
+                 topic=receipts_topic(st.session_state.family_code),
+                 sender=user_id)
+
+
+def _mark_delivered(pending, user_id):
+    undelivered = [alert[0] for alert in pending if alert[4] is None]
+    if not undelivered:
+        return
+    placeholders = ", ".join("?" * len(undelivered))
+    db.execute(
+        f"""UPDATE alert_deliveries SET delivered_at = ?
+            WHERE user_id = ? AND delivered_at IS NULL
+              AND alert_id IN ({placeholders})""",
+        (db.now_ms(), user_id, *undelivered))
+    live.publish(st.session_state.family_code, "alert_receipt",
+                 topic=receipts_topic(st.session_state.family_code),
+                 sender=user_id)
+
+
+def rerun_kinds(page):
+    # Hub events from others that live.notifications answers with a page
+    # rerun: new alerts everywhere, receipts while delivery status is shown
+    if page == "Family" and 'alert_status_cache' in st.session_state:
+        return ("alert", "alert_receipt")
+    return ("alert", )
+
+
+# Pending alerts are only read again when one is sent to the family. The
+# banner has no timer of its own: the live tick reruns the page when an
+# alert arrives, and Acknowledge reruns just this fragment.
+@st.fragment
+def banner(user):
+    version = live.get_hub().version(alerts_topic(st.session_state.family_code))
+    cached = st.session_state.get('alert_cache')
+    if cached is None or cached[0] != version:
+        pending = db.query(db.PENDING_ALERTS, (user['id'], ))
+        # Stamped as the alerts reach the page, before they are drawn
+        _mark_delivered(pending, user['id'])
+        cached = st.session_state.alert_cache = (version, pending)
+
+    for alert_id, sender, message, created_at, _ in cached[1]:
+        st.error(f"🚨 **Emergency alert from {sender}**\n\n{message}\n\n"
+                 f"{local_time(created_at)}")
+        st.button("Acknowledge",
+                  key=f"ack_alert_{alert_id}",
+                  icon="✅",
+                  on_click=acknowledge,
+                  args=(alert_id, user['id']))
+
+
+def _status(delivered_at, acknowledged_at, created_at):
+    if delivered_at is None:
+        return "⏳ Not seen yet"
+    latency = delivered_at - created_at
+    seen = (f"👀 Seen after {latency} ms" if latency < 1000 else
+            f"👀 Seen after {latency / 1000:.1f} s")
+    if acknowledged_at is None:
+        return seen
+    return f"{seen} • ✅ Acknowledged"
+
+
+@st.fragment
+def delivery_status(family_code):
+    # Redrawn by the live tick whenever a member sees or acknowledges an
+    # alert (see rerun_kinds)
+    version = (live.get_hub().version(alerts_topic(family_code)),
+               live.get_hub().version(receipts_topic(family_code)))
+    cached = st.session_state.get('alert_status_cache')
+    if cached is None or cached[0] != version:
+        rows = db.query(db.ALERT_DELIVERY_STATUS, (family_code, ALERT_HISTORY))
+        cached = st.session_state.alert_status_cache = (version, rows)
+
+    alert_id = None
+    for row in cached[1]:
+        if row[0] != alert_id:
+            alert_id = row[0]
+            st.markdown(f"**{row[1]}** — {local_time(row[2])}")
+        st.caption(f"{row[3]}: {_status(row[4], row[5], row[2])}")
@@ -0,0 +1,326 @@
+"""HTML for post, chore, mood, location, activity and search result cards,
+memoized across reruns."""
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+from together import media
+from together.session import local_time, viewer_timezone_name
+
+# Upper bound on the cached cards (keys and HTML) held by the process, in
+# bytes
+CARD_CACHE_BYTES = 16 * 1024 * 1024
+
+# Rendered width of a post photo, matching .app-container
+PHOTO_SIZES = "(max-width: 500px) 100vw, 500px"
+
+
+class CardCache:
+    """LRU of rendered card HTML, bounded by the size of keys and HTML.
+
+    Keys carry the card kind, the row as read (so any change to a shown
+    column is a new key, which stands in for an updated_at version) and the
+    viewer-dependent bits. The rows are about as large as the HTML, so both
+    count towards max_bytes. Stale entries are never looked up again and
+    age out of the LRU.
+    """
+
+    def __init__(self, max_bytes=CARD_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def get(self, key, render):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+
+        html = render()
+        size = _sizeof(key) + sys.getsizeof(html)
+        if size > self.max_bytes:
+            return html
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (html, size)
+                self._size += size
+                while self._size > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._size -= evicted
+        return html
+
+
+def _sizeof(value):
+    # Bytes held by a key: the tuples and everything in them. Values shared
+    # with other keys are counted each time, which errs on the safe side.
+    size = sys.getsizeof(value)
+    if isinstance(value, tuple):
+        size += sum(_sizeof(item) for item in value)
+    return size
+
+
+@st.cache_resource
+def get_card_cache():
+    return CardCache()
+
+
+def _when(created_at):
+    # Formatted only when a card is rendered, never on a cache hit
+    return local_time(created_at) if created_at else ""
+
+
+# Times are formatted for the viewer, so every key carries the viewer's
+# time zone name next to the row and its created_at
+def post(row, like_count, user_liked):
+    # row is a FEED_PAGE row; the like state may be fresher than the row.
+    return get_card_cache().get(
+        ("post", row, like_count, user_liked, viewer_timezone_name()),
+        lambda: _post_html(row, like_count, user_liked, _when(row[7])))
+
+
+def chore(row, status):
+    return get_card_cache().get(
+        ("chore", row, status, viewer_timezone_name()),
+        lambda: _chore_html(row, status, _when(row[6])))
+
+
+def mood(row):
+    return get_card_cache().get(("mood", row, viewer_timezone_name()),
+                                lambda: _mood_html(row, _when(row[2])))
+
+
+def location(row):
+    return get_card_cache().get(("location", row, viewer_timezone_name()),
+                                lambda: _location_html(row, _when(row[5])))
+
+
+def conversation(row, viewer_id):
+    # row is an INBOX row
+    return get_card_cache().get(
+        ("conversation", row, viewer_id, viewer_timezone_name()),
+        lambda: _conversation_html(row, viewer_id, _when(row[5])))
+
+
+def message(row, mine):
+    # row is a THREAD_PAGE row
+    return get_card_cache().get(
+        ("message", row, mine, viewer_timezone_name()),
+        lambda: _message_html(row, mine, _when(row[5])))
+
+
+def activity(kind, row):
+    # row is a TIMELINE_PAGES row
+    return get_card_cache().get(
+        ("activity", kind, row, viewer_timezone_name()),
+        lambda: _activity_html(kind, row, _when(row[0])))
+
+
+def search_result(kind, row):
+    # row is a SEARCH_QUERIES row; the rank is left out of the key
+    return get_card_cache().get(
+        ("search", kind, row[1:], viewer_timezone_name()),
+        lambda: _search_result_html(kind, row, _when(row[5])))
+
+
+def _post_html(post, like_count, user_liked, when):
+    comment_count = post[10]
+    return f'''
+    <div class="post">
+        <div class="post-header">
+            <div class="post-user-info">
+                <img src="{media.url(post[2], "avatar")}" class="post-avatar">
+                <div>
+                    <div class="post-username">{post[3]}</div>
+                    {f'<div class="post-location">📍 {post[6]}</div>' if post[6] else ''}
+                </div>
+            </div>
+        </div>
+        {_photo_html(post[5], post[12])}
+        <div class="post-content">{post[4]}</div>
+        <div class="post-actions">
+            <span style="color: {'#ed4956' if user_liked else '#262626'}">
+                {'❤️' if user_liked else '🤍'}
+            </span>
+            <span>💬{f' {comment_count}' if comment_count else ''}</span>
+            <span>📤</span>
+        </div>
+        {f'<div class="post-likes">{like_count} likes</div>' if like_count > 0 else ''}
+        <div class="post-timestamp">{when}</div>
+    </div>
+    '''
+
+
+def _photo_html(ref, stored_widths):
+    # The browser picks a width from srcset and fetches it only as the post
+    # scrolls near the viewport. stored_widths is the post's image_widths.
+    if not ref:
+        return ''
+    widths = json.loads(stored_widths) if stored_widths else {}
+    # A photo smaller than the medium size has no medium variant
+    size = ("medium" if "medium" in widths or not widths else
+            max(widths, key=widths.get))
+    srcset = media.srcset(ref, widths)
+    return (f'<img src="{media.url(ref, size)}"'
+            + (f' srcset="{srcset}" sizes="{PHOTO_SIZES}"' if srcset else '')
+            + ' loading="lazy" decoding="async" class="post-image" alt="">')
+
+
+def _chore_html(chore, status, when):
+    status_color = "#00d851" if status == "Completed" else "#ed4956"
+    return f'''
+    <div class="post">
+        <div class="post-header">
+            <div class="post-user-info">
+                <div>
+                    <div class="post-username">{chore[1]}</div>
+                    <div class="post-location">👤 {chore[2]} • ⭐ {chore[3]} stars</div>
+                </div>
+            </div>
+            <div style="color: {status_color}; font-weight: 600; font-size: 14px;">
+                {status}
+            </div>
+        </div>
+        <div class="post-timestamp">Added by {chore[5]} • {when}</div>
+    </div>
+    '''
+
+
+def _mood_html(mood, when):
+    return f'''
+    <div class="post">
+        <div class="post-header">
+            <div class="post-user-info">
+                <img src="{media.url(mood[3], "avatar")}" class="post-avatar">
+                <div>
+                    <div class="post-username">{mood[0]}</div>
+                    <div class="post-location">is feeling {mood[1]}</div>
+                </div>
+            </div>
+        </div>
+        <div class="post-timestamp">{when}</div>
+    </div>
+    '''
+
+
+def _location_html(location, when):
+    return f'''
+    <div class="post">
+        <div class="post-header">
+            <div class="post-user-info">
+                <img src="{media.url(location[6], "avatar")}" class="post-avatar">
+                <div>
+                    <div class="post-username">📍 {location[1]}</div>
+                    <div class="post-location">{location[0]} • {when}</div>
+                </div>
+            </div>
+        </div>
+        <div class="post-content">
+            📌 {location[2]:.4f}, {location[3]:.4f}
+            {f'<br>{location[4]}' if location[4] else ''}
+        </div>
+    </div>
+    '''
+
+
+def _conversation_html(conversation, viewer_id, when):
+    last = conversation[3] or "No messages yet"
+    if conversation[3] and conversation[4] == viewer_id:
+        last = f"You: {last}"
+    unread = conversation[6]
+    return f'''
+    <div class="post">
+        <div class="post-header">
+            <div class="post-user-info">
+                <img src="{media.url(conversation[2], "avatar")}" class="post-avatar">
+                <div>
+                    <div class="post-username">{conversation[1]}</div>
+                    <div class="post-location">{last}</div>
+                </div>
+            </div>
+            {f'<div class="unread-badge">{unread}</div>' if unread else ''}
+        </div>
+        <div class="post-timestamp">{when}</div>
+    </div>
+    '''
+
+
+def _message_html(message, mine, when):
+    return f'''
+    <div class="message {'message-mine' if mine else ''}">
+        <div class="message-bubble">
+            {'' if mine else f'<div class="message-sender">{message[2]}</div>'}
+            <div>{message[4]}</div>
+            <div class="message-time">{when}</div>
+        </div>
+    </div>
+    '''
+
+
+# (icon, what the member did) for each timeline kind
+ACTIVITY_LABELS = {
+    "post": ("📝", "shared a post"),
+    "mood": ("😊", "is feeling"),
+    "chore": ("✅", "added a chore"),
+    "achievement": ("🏆", "earned an achievement"),
+    "learning": ("🧠", "learned about"),
+    "location": ("📍", "is at"),
+}
+
+
+def _activity_html(kind, item, when):
+    icon, action = ACTIVITY_LABELS[kind]
+    detail = item[5]
+    if kind == "chore" and detail:
+        detail = f"for {detail}"
+    return f'''
+    <div class="post">
+        <div class="post-header">
+            <div class="post-user-info">
+                <img src="{media.url(item[3], "avatar")}" class="post-avatar">
+                <div>
+                    <div class="post-username">{icon} {item[2]}</div>
+                    <div class="post-location">{action}</div>
+                </div>
+            </div>
+        </div>
+        <div class="post-content">
+            {item[4]}
+            {f'<br>{detail}' if detail else ''}
+        </div>
+        <div class="post-timestamp">{when}</div>
+    </div>
+    '''
+
+
+# Icon and label for each kind of search result
+SEARCH_LABELS = {
+    "post": ("📝", "Post"),
+    "journal": ("📓", "Your journal"),
+    "book": ("📚", "Book"),
+    "book_review": ("⭐", "Book review"),
+    "chore": ("✅", "Chore"),
+}
+
+
+def _search_result_html(kind, result, when):
+    icon, label = SEARCH_LABELS[kind]
+    return f'''
+    <div class="post">
+        <div class="post-header">
+            <div class="post-user-info">
+                <img src="{media.url(result[3], "avatar")}" class="post-avatar">
+                <div>
+                    <div class="post-username">{result[2]}</div>
+                    <div class="post-location">{icon} {label}</div>
+                </div>
+            </div>
+        </div>
+        <div class="post-content search-match">{result[4]}</div>
+        {f'<div class="post-timestamp">{when}</div>' if when else ''}
+    </div>
+    '''
@@ -0,0 +1,1311 @@
+"""SQLite access layer shared by every Streamlit session."""
+import base64
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+
+from together import media
+
+DB_PATH = "together_app.db"
+
+# Oldest SQLite the schema and page queries run on: keyset pages compare
+# row values, which arrived in 3.15
+MIN_SQLITE_VERSION = (3, 15, 0)
+
+# Connections kept warm between reruns; bursts above this open extra
+# connections that are closed again when they are handed back.
+POOL_SIZE = 8
+
+# How long a writer waits on a locked database before giving up
+BUSY_TIMEOUT_MS = 5000
+
+# Seconds a cached family roster is served before it is read again
+ROSTER_TTL = 300
+
+# Seconds a queued write waits for others to share its commit, and the most
+# statements one commit takes
+GROUP_COMMIT_WINDOW = 0.005
+GROUP_COMMIT_MAX = 256
+
+# Create all tables with proper schema
+TABLES = [
+    '''CREATE TABLE IF NOT EXISTS families (
+        id TEXT PRIMARY KEY, 
+        name TEXT, 
+        invite_code TEXT UNIQUE, 
+        created_by TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS users (
+        id TEXT PRIMARY KEY,
+        name TEXT,
+        username TEXT UNIQUE,
+        age INTEGER,
+        avatar TEXT,
+        role TEXT,
+        bio TEXT,
+        family_code TEXT,
+        parental_controls BOOLEAN DEFAULT 0,
+        linked_parent TEXT,
+        password_hash TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS posts (
+        id TEXT PRIMARY KEY, 
+        user_id TEXT, 
+        avatar TEXT, 
+        username TEXT, 
+        content TEXT, 
+        image TEXT, 
+        location TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS post_likes (
+        id TEXT PRIMARY KEY, 
+        post_id TEXT, 
+        user_id TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS post_comments (
+        id TEXT PRIMARY KEY, 
+        post_id TEXT, 
+        user_id TEXT, 
+        comment TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS messages (
+        id TEXT PRIMARY KEY, 
+        sender TEXT, 
+        recipient TEXT, 
+        message TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS moods (
+        id TEXT PRIMARY KEY, 
+        user_id TEXT, 
+        username TEXT, 
+        mood TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS journals (
+        id TEXT PRIMARY KEY, 
+        user_id TEXT, 
+        content TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS books (
+        id TEXT PRIMARY KEY, 
+        title TEXT, 
+        author TEXT, 
+        url TEXT, 
+        added_by TEXT, 
+        age_group TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS book_reviews (
+        id TEXT PRIMARY KEY, 
+        book_id TEXT, 
+        reviewer TEXT, 
+        rating INTEGER, 
+        review TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS achievements (
+        id TEXT PRIMARY KEY, 
+        user_id TEXT, 
+        username TEXT, 
+        title TEXT, 
+        description TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS chores (
+        id TEXT PRIMARY KEY, 
+        task TEXT, 
+        assigned_to TEXT, 
+        reward INTEGER, 
+        status TEXT, 
+        added_by TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS alerts (
+        id TEXT PRIMARY KEY, 
+        sender TEXT, 
+        message TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS learning (
+        id TEXT PRIMARY KEY, 
+        user_id TEXT, 
+        topic TEXT, 
+        score TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS locations (
+        id TEXT PRIMARY KEY, 
+        user_id TEXT, 
+        username TEXT, 
+        location_name TEXT, 
+        latitude REAL, 
+        longitude REAL, 
+        notes TEXT, 
+        timestamp TEXT
+    )''', '''CREATE TABLE IF NOT EXISTS safe_sites (
+        id TEXT PRIMARY KEY,
+        name TEXT,
+        url TEXT,
+        description TEXT,
+        approved_by TEXT,
+        timestamp TEXT
+    )'''
+]
+
+# Secondary indexes for every lookup the pages make. families.invite_code
+# and users.username are already covered by their UNIQUE constraints.
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_users_family_code ON users (family_code)",
+    "CREATE INDEX IF NOT EXISTS idx_posts_user_timestamp ON posts (user_id, timestamp)",
+    # Unique so a double-click can never record two likes
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_post_likes_post_user ON post_likes (post_id, user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_moods_user_timestamp ON moods (user_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_locations_user_timestamp ON locations (user_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_learning_user_timestamp ON learning (user_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_chores_added_by_timestamp ON chores (added_by, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_safe_sites_name ON safe_sites (name)",
+]
+
+# Sites every family's Browser page starts with
+DEFAULT_SITES = [
+    ("National Geographic Kids", "https://kids.nationalgeographic.com",
+     "Learn about animals and nature", "system"),
+    ("NASA Kids", "https://www.nasa.gov/audience/forkids/",
+     "Space exploration for kids", "system"),
+    ("Smithsonian for Kids", "https://www.si.edu/kids", "Museums and learning",
+     "system"),
+    ("Fun Brain", "https://www.funbrain.com", "Educational games and books",
+     "system"),
+    ("Scratch Programming", "https://scratch.mit.edu",
+     "Learn to code with Scratch", "system"),
+    ("Khan Academy Kids", "https://www.khanacademy.org/kids",
+     "Educational videos and exercises", "system")
+]
+
+# Queries the pages run on every render. They live here so their plans can be
+# checked against INDEXES with `python -m together.db`.
+FAMILY_BY_INVITE = "SELECT * FROM families WHERE invite_code = ?"
+
+USER_BY_USERNAME = """
+    SELECT id, name, username, age, avatar, role, bio, family_code,
+           parental_controls, linked_parent, password_hash
+    FROM users WHERE username = ?
+"""
+
+# Served through family_roster(), which caches it per family
+FAMILY_ROSTER = """
+    SELECT name, username, avatar, age, role, bio, id
+    FROM users WHERE family_code = ?
+"""
+
+# One feed page of post rows followed by their like count, whether the
+# viewer (first parameter) liked them and their comment count. Pages are
+# keyed on (created_at, id) of the last post shown; FEED_HEAD starts from the
+# newest post.
+FEED_PAGE = """
+    SELECT p.id, p.user_id, u.avatar, u.username, p.content, p.image,
+           p.location, p.created_at, p.like_count,
+           EXISTS (SELECT 1 FROM post_likes l
+                   WHERE l.post_id = p.id AND l.user_id = ?),
+           p.comment_count, p.image_bytes, p.image_widths
+    FROM posts p
+    JOIN users u ON u.id = p.user_id
+    WHERE p.family_code = ? AND (p.created_at, p.id) < (?, ?)
+    ORDER BY p.created_at DESC, p.id DESC
+    LIMIT ?
+"""
+
+FEED_HEAD = (2**63 - 1, "")
+
+# Refreshes a single post card after a like without re-reading the feed
+POST_LIKES = """
+    SELECT p.like_count,
+           EXISTS (SELECT 1 FROM post_likes l
+                   WHERE l.post_id = p.id AND l.user_id = ?)
+    FROM posts p
+    WHERE p.id = ?
+"""
+
+LEARNING_HISTORY = """
+    SELECT * FROM learning WHERE user_id = ? ORDER BY created_at DESC
+"""
+
+SAFE_SITES = "SELECT * FROM safe_sites ORDER BY name"
+
+FAMILY_CHORES = """
+    SELECT id, task, assigned_to, reward, status, added_by, created_at
+    FROM chores
+    WHERE family_code = ?
+    ORDER BY created_at DESC
+"""
+
+FAMILY_MOODS = """
+    SELECT u.username, m.mood, m.created_at, u.avatar
+    FROM moods m
+    JOIN users u ON m.user_id = u.id
+    WHERE m.family_code = ?
+    ORDER BY m.created_at DESC LIMIT 10
+"""
+
+FAMILY_LOCATIONS = """
+    SELECT u.username, l.location_name, l.latitude, l.longitude, l.notes,
+           l.created_at, u.avatar
+    FROM locations l
+    JOIN users u ON l.user_id = u.id
+    WHERE l.family_code = ?
+    ORDER BY l.created_at DESC LIMIT 10
+"""
+
+# A viewer's conversations, most recent first, with the other member, the
+# last message and the viewer's unread count. Served by
+# idx_conversation_members_user without touching messages beyond one row.
+INBOX = """
+    SELECT c.id, u.username, u.avatar, m.message, m.sender, c.last_message_at,
+           me.unread_count
+    FROM conversation_members me
+    JOIN conversations c ON c.id = me.conversation_id
+    JOIN conversation_members them
+      ON them.conversation_id = me.conversation_id AND them.user_id != me.user_id
+    JOIN users u ON u.id = them.user_id
+    LEFT JOIN messages m ON m.id = c.last_message_id
+    WHERE me.user_id = ?
+    ORDER BY me.last_message_at DESC
+    LIMIT ?
+"""
+
+CONVERSATION_BY_PAIR = "SELECT id FROM conversations WHERE pair_key = ?"
+
+CONVERSATION_MEMBERS = """
+    SELECT user_id FROM conversation_members WHERE conversation_id = ?
+"""
+
+# One page of a thread, newest first, keyed on (created_at, id) like the
+# feed; THREAD_HEAD starts from the newest message.
+THREAD_PAGE = """
+    SELECT m.id, m.sender, u.username, u.avatar, m.message, m.created_at
+    FROM messages m
+    JOIN users u ON u.id = m.sender
+    WHERE m.conversation_id = ? AND (m.created_at, m.id) < (?, ?)
+    ORDER BY m.created_at DESC, m.id DESC
+    LIMIT ?
+"""
+
+THREAD_HEAD = (2**63 - 1, "")
+
+# Alerts a member has not acknowledged yet, newest first
+PENDING_ALERTS = """
+    SELECT a.id, a.sender, a.message, a.created_at, d.delivered_at
+    FROM alert_deliveries d
+    JOIN alerts a ON a.id = d.alert_id
+    WHERE d.user_id = ? AND d.acknowledged_at IS NULL
+    ORDER BY a.created_at DESC
+"""
+
+# Per-recipient status of a family's most recent alerts
+ALERT_DELIVERY_STATUS = """
+    SELECT a.id, a.message, a.created_at, u.username, d.delivered_at,
+           d.acknowledged_at
+    FROM alerts a
+    JOIN alert_deliveries d ON d.alert_id = a.id
+    JOIN users u ON u.id = d.user_id
+    WHERE a.id IN (SELECT id FROM alerts WHERE family_code = ?
+                   ORDER BY created_at DESC LIMIT ?)
+    ORDER BY a.created_at DESC, u.username
+"""
+
+# One keyset page per kind of family activity, newest first, for the merged
+# timeline (see together.timeline). Every kind returns the same columns:
+# created_at, id, username, avatar, title, detail.
+TIMELINE_PAGES = {
+    "post": """
+        SELECT p.created_at, p.id, u.username, u.avatar, p.content, p.location
+        FROM posts p
+        JOIN users u ON u.id = p.user_id
+        WHERE p.family_code = ? AND (p.created_at, p.id) < (?, ?)
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT ?
+    """,
+    "mood": """
+        SELECT m.created_at, m.id, u.username, u.avatar, m.mood, NULL
+        FROM moods m
+        JOIN users u ON u.id = m.user_id
+        WHERE m.family_code = ? AND (m.created_at, m.id) < (?, ?)
+        ORDER BY m.created_at DESC, m.id DESC
+        LIMIT ?
+    """,
+    "chore": """
+        SELECT c.created_at, c.id, c.added_by, u.avatar, c.task, c.assigned_to
+        FROM chores c
+        LEFT JOIN users u ON u.username = c.added_by
+        WHERE c.family_code = ? AND (c.created_at, c.id) < (?, ?)
+        ORDER BY c.created_at DESC, c.id DESC
+        LIMIT ?
+    """,
+    "achievement": """
+        SELECT a.created_at, a.id, u.username, u.avatar, a.title,
+               a.description
+        FROM achievements a
+        JOIN users u ON u.id = a.user_id
+        WHERE a.family_code = ? AND (a.created_at, a.id) < (?, ?)
+        ORDER BY a.created_at DESC, a.id DESC
+        LIMIT ?
+    """,
+    "learning": """
+        SELECT l.created_at, l.id, u.username, u.avatar, l.topic, l.score
+        FROM learning l
+        JOIN users u ON u.id = l.user_id
+        WHERE l.family_code = ? AND (l.created_at, l.id) < (?, ?)
+        ORDER BY l.created_at DESC, l.id DESC
+        LIMIT ?
+    """,
+    "location": """
+        SELECT l.created_at, l.id, u.username, u.avatar, l.location_name,
+               l.notes
+        FROM locations l
+        JOIN users u ON u.id = l.user_id
+        WHERE l.family_code = ? AND (l.created_at, l.id) < (?, ?)
+        ORDER BY l.created_at DESC, l.id DESC
+        LIMIT ?
+    """,
+}
+
+TIMELINE_HEAD = (2**63 - 1, "")
+
+# Ranked full-text matches per kind, best first (FTS5 rank is bm25, lower is
+# better), limited to what the viewer may see. Column 0 of each FTS table is
+# the row id; the text columns follow. Parameters: the MATCH
+# expression, the scope, then the limit. Every kind returns the same
+# columns: rank, id, username, avatar, text with <mark>ed matches,
+# created_at (NULL for books). See together.search.
+SEARCH_QUERIES = {
+    "post": """
+        SELECT posts_fts.rank, p.id, u.username, u.avatar,
+               snippet(posts_fts, 1, '<mark>', '</mark>', '…', 16),
+               p.created_at
+        FROM posts_fts
+        JOIN posts p ON p.id = posts_fts.id
+        JOIN users u ON u.id = p.user_id
+        WHERE posts_fts MATCH ? AND p.family_code = ?
+        ORDER BY posts_fts.rank
+        LIMIT ?
+    """,
+    # Journals are private: only ever the viewer's own
+    "journal": """
+        SELECT journals_fts.rank, j.id, u.username, u.avatar,
+               snippet(journals_fts, 1, '<mark>', '</mark>', '…', 16),
+               j.created_at
+        FROM journals_fts
+        JOIN journals j ON j.id = journals_fts.id
+        JOIN users u ON u.id = j.user_id
+        WHERE journals_fts MATCH ? AND j.user_id = ?
+        ORDER BY journals_fts.rank
+        LIMIT ?
+    """,
+    # Books belong to the family of the member who added them; the second
+    # scope parameter is a JSON list of age groups hidden from the viewer
+    "book": """
+        SELECT books_fts.rank, b.id, u.username, u.avatar,
+               highlight(books_fts, 1, '<mark>', '</mark>') || ' by ' ||
+               highlight(books_fts, 2, '<mark>', '</mark>'),
+               NULL
+        FROM books_fts
+        JOIN books b ON b.id = books_fts.id
+        JOIN users u ON u.username = b.added_by
+        WHERE books_fts MATCH ? AND u.family_code = ?
+          AND b.age_group NOT IN (SELECT value FROM json_each(?))
+        ORDER BY books_fts.rank
+        LIMIT ?
+    """,
+    "book_review": """
+        SELECT book_reviews_fts.rank, r.id, r.reviewer, reviewer.avatar,
+               b.title || ': ' ||
+               snippet(book_reviews_fts, 1, '<mark>', '</mark>', '…', 16),
+               r.created_at
+        FROM book_reviews_fts
+        JOIN book_reviews r ON r.id = book_reviews_fts.id
+        JOIN books b ON b.id = r.book_id
+        JOIN users u ON u.username = b.added_by
+        LEFT JOIN users reviewer ON reviewer.username = r.reviewer
+        WHERE book_reviews_fts MATCH ? AND u.family_code = ?
+          AND b.age_group NOT IN (SELECT value FROM json_each(?))
+        ORDER BY book_reviews_fts.rank
+        LIMIT ?
+    """,
+    "chore": """
+        SELECT chores_fts.rank, c.id, c.added_by, u.avatar,
+               snippet(chores_fts, 1, '<mark>', '</mark>', '…', 16),
+               c.created_at
+        FROM chores_fts
+        JOIN chores c ON c.id = chores_fts.id
+        LEFT JOIN users u ON u.username = c.added_by
+        WHERE chores_fts MATCH ? AND c.family_code = ?
+        ORDER BY chores_fts.rank
+        LIMIT ?
+    """,
+}
+
+PAGE_QUERIES = {
+    "family_by_invite": FAMILY_BY_INVITE,
+    "user_by_username": USER_BY_USERNAME,
+    "family_roster": FAMILY_ROSTER,
+    "feed_page": FEED_PAGE,
+    "post_likes": POST_LIKES,
+    "learning_history": LEARNING_HISTORY,
+    "safe_sites": SAFE_SITES,
+    "family_chores": FAMILY_CHORES,
+    "family_moods": FAMILY_MOODS,
+    "family_locations": FAMILY_LOCATIONS,
+    "inbox": INBOX,
+    "conversation_by_pair": CONVERSATION_BY_PAIR,
+    "conversation_members": CONVERSATION_MEMBERS,
+    "thread_page": THREAD_PAGE,
+    "pending_alerts": PENDING_ALERTS,
+    "alert_delivery_status": ALERT_DELIVERY_STATUS,
+    **{f"timeline_{kind}": sql for kind, sql in TIMELINE_PAGES.items()},
+    **{f"search_{kind}": sql for kind, sql in SEARCH_QUERIES.items()},
+}
+
+
+class ConnectionPool:
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self):
+        # Autocommit mode: reads never hold a transaction open and writers
+        # take the write lock explicitly in transaction().
+        conn = sqlite3.connect(self.path,
+                               timeout=BUSY_TIMEOUT_MS / 1000,
+                               isolation_level=None,
+                               check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        # A connection is only ever used by one script thread at a time
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+
+def _migrate_initial_schema(conn):
+    # Check if users table needs migration
+    try:
+        conn.execute("SELECT username FROM users LIMIT 1")
+    except sqlite3.OperationalError:
+        # Table exists but doesn't have username column, need to recreate
+        conn.execute("DROP TABLE IF EXISTS users")
+
+    for table in TABLES:
+        conn.execute(table)
+
+
+def _migrate_unique_site_urls(conn):
+    # Older databases gained six uuid-keyed copies of the default sites on
+    # every rerun; keep the first row per URL and forbid further duplicates.
+    conn.execute("""
+        DELETE FROM safe_sites
+        WHERE rowid NOT IN (SELECT MIN(rowid) FROM safe_sites GROUP BY url)
+    """)
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_safe_sites_url ON safe_sites (url)")
+
+    for site in DEFAULT_SITES:
+        conn.execute("""
+            INSERT OR IGNORE INTO safe_sites
+              (id, name, url, description, approved_by, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            str(uuid.uuid4()),
+            site[0],
+            site[1],
+            site[2],
+            site[3],
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        ))
+
+
+
+def _migrate_lookup_indexes(conn):
+    # Collapse double-likes left by older versions before making them unique
+    conn.execute("""
+        DELETE FROM post_likes
+        WHERE rowid NOT IN (
+            SELECT MIN(rowid) FROM post_likes GROUP BY post_id, user_id
+        )
+    """)
+    for index in INDEXES:
+        conn.execute(index)
+
+
+def _migrate_post_family_code(conn):
+    # Feed pages filter and order on posts alone, so a page is a single
+    # index range instead of a join over every member's history.
+    conn.execute("ALTER TABLE posts ADD COLUMN family_code TEXT")
+    conn.execute("""
+        UPDATE posts SET family_code =
+            (SELECT family_code FROM users WHERE users.id = posts.user_id)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_posts_family_timestamp
+        ON posts (family_code, timestamp, id)
+    """)
+
+
+# Keep posts.like_count and posts.comment_count in step with their tables.
+# INSERT OR IGNORE of an existing like inserts nothing and fires nothing.
+POST_COUNTER_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS trg_post_likes_insert
+       AFTER INSERT ON post_likes BEGIN
+           UPDATE posts SET like_count = like_count + 1 WHERE id = NEW.post_id;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_post_likes_delete
+       AFTER DELETE ON post_likes BEGIN
+           UPDATE posts SET like_count = like_count - 1 WHERE id = OLD.post_id;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_post_comments_insert
+       AFTER INSERT ON post_comments BEGIN
+           UPDATE posts SET comment_count = comment_count + 1
+           WHERE id = NEW.post_id;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_post_comments_delete
+       AFTER DELETE ON post_comments BEGIN
+           UPDATE posts SET comment_count = comment_count - 1
+           WHERE id = OLD.post_id;
+       END""",
+]
+
+
+def repair_post_counters(conn):
+    # Recompute the trigger-maintained counters from the source tables
+    conn.execute("""
+        UPDATE posts SET
+            like_count = (SELECT COUNT(*) FROM post_likes l
+                          WHERE l.post_id = posts.id),
+            comment_count = (SELECT COUNT(*) FROM post_comments c
+                             WHERE c.post_id = posts.id)
+    """)
+
+
+def _migrate_post_counters(conn):
+    # Denormalized counters so the feed reads counts straight off the post row
+    conn.execute(
+        "ALTER TABLE posts ADD COLUMN like_count INTEGER NOT NULL DEFAULT 0")
+    conn.execute(
+        "ALTER TABLE posts ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_post_comments_post ON post_comments (post_id)")
+    for trigger in POST_COUNTER_TRIGGERS:
+        conn.execute(trigger)
+    repair_post_counters(conn)
+
+
+def _inline_image_to_media(value):
+    # "data:image/jpeg;base64,..." -> media reference; anything else unchanged
+    header, _, payload = value.partition(",")
+    ext = header[len("data:image/"):].split(";")[0].replace("jpeg", "jpg")
+    return media.store(base64.b64decode(payload), ext or "jpg")
+
+
+def _migrate_inline_images_to_media(conn):
+    # Avatars used to be stored as base64 data URIs and copied into posts
+    for table in ("users", "posts"):
+        rows = conn.execute(
+            f"SELECT DISTINCT avatar FROM {table} WHERE avatar LIKE 'data:image/%'"
+        ).fetchall()
+        for (avatar, ) in rows:
+            conn.execute(f"UPDATE {table} SET avatar = ? WHERE avatar = ?",
+                         (_inline_image_to_media(avatar), avatar))
+
+
+def _drop_columns(conn, table, columns):
+    # ALTER TABLE ... DROP COLUMN needs SQLite 3.35, so rebuild the table
+    # instead: copy the remaining columns (and rowids) into a new table and
+    # swap it in. Types, NOT NULL, defaults, the primary key, UNIQUE
+    # constraints, indexes and triggers carry over.
+    kept = [column for column in conn.execute(f"PRAGMA table_info({table})")
+            if column[1] not in columns]
+    definitions = []
+    for _, name, type_, notnull, default, _ in kept:
+        definitions.append(f"{name} {type_}"
+                           + (" NOT NULL" if notnull else "")
+                           + (f" DEFAULT {default}" if default is not None
+                              else ""))
+    primary_key = [column[1] for column in sorted(kept, key=lambda c: c[5])
+                   if column[5]]
+    if primary_key:
+        definitions.append(f"PRIMARY KEY ({', '.join(primary_key)})")
+    for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+        if index[3] == "u":
+            unique = [row[2] for row in
+                      conn.execute(f"PRAGMA index_info({index[1]})")]
+            definitions.append(f"UNIQUE ({', '.join(unique)})")
+    schema = conn.execute(
+        """SELECT sql FROM sqlite_master
+           WHERE tbl_name = ? AND type IN ('index', 'trigger')
+             AND sql IS NOT NULL""", (table, )).fetchall()
+
+    names = ", ".join(column[1] for column in kept)
+    conn.execute(f"CREATE TABLE {table}_rebuild ({', '.join(definitions)})")
+    conn.execute(f"INSERT INTO {table}_rebuild (rowid, {names}) "
+                 f"SELECT rowid, {names} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    # Triggers on other tables that name this one would fail the rename's
+    # schema check while the table is briefly missing
+    conn.execute("PRAGMA legacy_alter_table = ON")
+    conn.execute(f"ALTER TABLE {table}_rebuild RENAME TO {table}")
+    conn.execute("PRAGMA legacy_alter_table = OFF")
+    for (sql, ) in schema:
+        conn.execute(sql)
+
+
+def _migrate_drop_copied_profiles(conn):
+    # Avatar and username are read from users at render time, so a profile
+    # edit is a single-row write no matter how much history a member has.
+    _drop_columns(conn, "posts", ("avatar", "username"))
+    for table in ("moods", "locations", "achievements"):
+        _drop_columns(conn, table, ("username", ))
+
+
+# Tables whose TEXT timestamp column becomes created_at
+TIMESTAMP_TABLES = [
+    "families", "posts", "post_comments", "messages", "moods", "journals",
+    "book_reviews", "achievements", "chores", "alerts", "learning",
+    "locations", "safe_sites",
+]
+
+# The timestamp indexes, rebuilt on created_at
+EPOCH_INDEXES = {
+    "idx_posts_user_timestamp":
+        "CREATE INDEX IF NOT EXISTS idx_posts_user_created "
+        "ON posts (user_id, created_at)",
+    "idx_posts_family_timestamp":
+        "CREATE INDEX IF NOT EXISTS idx_posts_family_created "
+        "ON posts (family_code, created_at, id)",
+    "idx_moods_user_timestamp":
+        "CREATE INDEX IF NOT EXISTS idx_moods_user_created "
+        "ON moods (user_id, created_at)",
+    "idx_locations_user_timestamp":
+        "CREATE INDEX IF NOT EXISTS idx_locations_user_created "
+        "ON locations (user_id, created_at)",
+    "idx_learning_user_timestamp":
+        "CREATE INDEX IF NOT EXISTS idx_learning_user_created "
+        "ON learning (user_id, created_at)",
+    "idx_chores_added_by_timestamp":
+        "CREATE INDEX IF NOT EXISTS idx_chores_added_by_created "
+        "ON chores (added_by, created_at)",
+}
+
+
+def _migrate_epoch_timestamps(conn):
+    # "YYYY-MM-DD HH:MM:SS" strings in the server's local time become UTC
+    # epoch milliseconds, which sort numerically and survive DST changes.
+    # SQLite's 'utc' modifier converts from the same local zone the app
+    # wrote them in. Unparseable values become 0.
+    for old_index in EPOCH_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {old_index}")
+    for table in TIMESTAMP_TABLES:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN created_at INTEGER "
+                     "NOT NULL DEFAULT 0")
+        conn.execute(f"""
+            UPDATE {table} SET created_at = COALESCE(
+                CAST(strftime('%s', timestamp, 'utc') AS INTEGER) * 1000, 0)
+        """)
+        _drop_columns(conn, table, ("timestamp", ))
+    for index in EPOCH_INDEXES.values():
+        conn.execute(index)
+
+
+def _migrate_post_image_bytes(conn):
+    # Size of a photo post's largest stored variant, so a feed page can stop
+    # at a byte budget without touching the files
+    conn.execute("ALTER TABLE posts ADD COLUMN image_bytes INTEGER NOT NULL "
+                 "DEFAULT 0")
+    rows = conn.execute("SELECT id, image FROM posts WHERE image LIKE ?",
+                        (media.MEDIA_PREFIX + "%", )).fetchall()
+    for post_id, image in rows:
+        path = os.path.join(media.STATIC_DIR, image)
+        if os.path.exists(path):
+            conn.execute("UPDATE posts SET image_bytes = ? WHERE id = ?",
+                         (os.path.getsize(path), post_id))
+
+
+CONVERSATION_TABLES = [
+    # Direct conversations between two family members; pair_key is the two
+    # user ids, sorted and joined with ":", so each pair has one thread
+    """CREATE TABLE IF NOT EXISTS conversations (
+        id TEXT PRIMARY KEY,
+        family_code TEXT,
+        pair_key TEXT UNIQUE,
+        last_message_id TEXT,
+        last_message_at INTEGER NOT NULL DEFAULT 0,
+        created_at INTEGER NOT NULL DEFAULT 0
+    )""",
+    # One row per participant. last_message_at is copied from the
+    # conversation so the inbox orders on this table's own index.
+    """CREATE TABLE IF NOT EXISTS conversation_members (
+        conversation_id TEXT,
+        user_id TEXT,
+        unread_count INTEGER NOT NULL DEFAULT 0,
+        last_message_at INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (conversation_id, user_id)
+    ) WITHOUT ROWID""",
+]
+
+CONVERSATION_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_conversation_members_user "
+    "ON conversation_members (user_id, last_message_at)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_conversation_created "
+    "ON messages (conversation_id, created_at, id)",
+]
+
+# A new message moves its conversation's last-message pointer and bumps the
+# unread count of every participant except the sender
+CONVERSATION_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS trg_messages_insert
+       AFTER INSERT ON messages WHEN NEW.conversation_id IS NOT NULL BEGIN
+           UPDATE conversations
+           SET last_message_id = NEW.id, last_message_at = NEW.created_at
+           WHERE id = NEW.conversation_id;
+           UPDATE conversation_members
+           SET last_message_at = NEW.created_at,
+               unread_count = unread_count + (user_id != NEW.sender)
+           WHERE conversation_id = NEW.conversation_id;
+       END""",
+]
+
+
+def _migrate_conversations(conn):
+    # messages rows belong to a conversation from now on. Nothing wrote to
+    # the table before, so there is no history to group.
+    for table in CONVERSATION_TABLES:
+        conn.execute(table)
+    conn.execute("ALTER TABLE messages ADD COLUMN conversation_id TEXT")
+    for index in CONVERSATION_INDEXES:
+        conn.execute(index)
+    for trigger in CONVERSATION_TRIGGERS:
+        conn.execute(trigger)
+
+
+# One row per recipient of an alert. delivered_at is stamped when the alert
+# is first shown to them, acknowledged_at when they dismiss it.
+ALERT_TABLES = [
+    """CREATE TABLE IF NOT EXISTS alert_deliveries (
+        alert_id TEXT,
+        user_id TEXT,
+        delivered_at INTEGER,
+        acknowledged_at INTEGER,
+        PRIMARY KEY (alert_id, user_id)
+    ) WITHOUT ROWID""",
+]
+
+ALERT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_alert_deliveries_user "
+    "ON alert_deliveries (user_id, acknowledged_at)",
+    "CREATE INDEX IF NOT EXISTS idx_alerts_family_created "
+    "ON alerts (family_code, created_at)",
+]
+
+
+def _migrate_alert_deliveries(conn):
+    # Earlier alerts were never delivered to anyone; they keep no recipient
+    # rows, but get their family so they show in the sender's history
+    for table in ALERT_TABLES:
+        conn.execute(table)
+    conn.execute("ALTER TABLE alerts ADD COLUMN family_code TEXT")
+    conn.execute("""UPDATE alerts SET family_code =
+                        (SELECT family_code FROM users
+                         WHERE users.username = alerts.sender)""")
+    for index in ALERT_INDEXES:
+        conn.execute(index)
+
+
+# Activity tables that gain a family_code, with how to find it for old rows
+ACTIVITY_FAMILY_OWNERS = {
+    "moods": "users.id = moods.user_id",
+    "chores": "users.username = chores.added_by",
+    "achievements": "users.id = achievements.user_id",
+    "learning": "users.id = learning.user_id",
+    "locations": "users.id = locations.user_id",
+}
+
+
+def _migrate_activity_family_code(conn):
+    # As with posts: a family's rows are one (family_code, created_at, id)
+    # index range, so a page of any of them reads just that page
+    for table, owner in ACTIVITY_FAMILY_OWNERS.items():
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN family_code TEXT")
+        conn.execute(f"""
+            UPDATE {table} SET family_code =
+                (SELECT family_code FROM users WHERE {owner})
+        """)
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{table}_family_created
+            ON {table} (family_code, created_at, id)
+        """)
+
+
+# Full-text indexed columns per table
+SEARCH_SOURCES = {
+    "posts": ("content", ),
+    "journals": ("content", ),
+    "books": ("title", "author"),
+    "book_reviews": ("review", ),
+    "chores": ("task", ),
+}
+
+
+def _rowid_search_triggers(table, columns):
+    # First version of the index, kept so _migrate_search_index replays
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new = ", ".join(f"NEW.{column}" for column in columns)
+    old = ", ".join(f"OLD.{column}" for column in columns)
+    remove = (f"INSERT INTO {fts} ({fts}, rowid, {names}) "
+              f"VALUES ('delete', OLD.rowid, {old});")
+    add = f"INSERT INTO {fts} (rowid, {names}) VALUES (NEW.rowid, {new});"
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert
+            AFTER INSERT ON {table} BEGIN {add} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete
+            AFTER DELETE ON {table} BEGIN {remove} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_update
+            AFTER UPDATE OF {names} ON {table} BEGIN {remove} {add} END""",
+    ]
+
+
+def _migrate_search_index(conn):
+    for table, columns in SEARCH_SOURCES.items():
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts
+            USING fts5({", ".join(columns)}, content='{table}',
+                       content_rowid='rowid', tokenize='porter unicode61')
+        """)
+        for trigger in _rowid_search_triggers(table, columns):
+            conn.execute(trigger)
+        conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+
+
+def _id_search_triggers(table, columns):
+    # Second version, kept so _migrate_search_index_by_id replays
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new = ", ".join(f"NEW.{column}" for column in columns)
+    assignments = ", ".join(f"{column} = NEW.{column}" for column in columns)
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert
+            AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (id, {names}) VALUES (NEW.id, {new});
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete
+            AFTER DELETE ON {table} BEGIN
+                DELETE FROM {fts} WHERE id = OLD.id;
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_update
+            AFTER UPDATE OF {names} ON {table} BEGIN
+                UPDATE {fts} SET {assignments} WHERE id = OLD.id;
+            END""",
+    ]
+
+
+def _search_triggers(table, columns):
+    # The FTS table can only look a row up by its own rowid, so
+    # {table}_fts_map turns the row's id into that rowid for deletes and edits
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new = ", ".join(f"NEW.{column}" for column in columns)
+    assignments = ", ".join(f"{column} = NEW.{column}" for column in columns)
+    fts_rowid = f"(SELECT fts_rowid FROM {fts}_map WHERE id = OLD.id)"
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert
+            AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (id, {names}) VALUES (NEW.id, {new});
+                INSERT INTO {fts}_map (id, fts_rowid)
+                VALUES (NEW.id, last_insert_rowid());
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete
+            AFTER DELETE ON {table} BEGIN
+                DELETE FROM {fts} WHERE rowid = {fts_rowid};
+                DELETE FROM {fts}_map WHERE id = OLD.id;
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_update
+            AFTER UPDATE OF {names} ON {table} BEGIN
+                UPDATE {fts} SET {assignments} WHERE rowid = {fts_rowid};
+            END""",
+    ]
+
+
+def rebuild_search_index(conn):
+    # Re-reads every indexed table, like repair_post_counters for counters
+    for table, columns in SEARCH_SOURCES.items():
+        names = ", ".join(columns)
+        conn.execute(f"DELETE FROM {table}_fts")
+        conn.execute(f"DELETE FROM {table}_fts_map")
+        conn.execute(f"INSERT INTO {table}_fts (id, {names}) "
+                     f"SELECT id, {names} FROM {table}")
+        conn.execute(f"INSERT INTO {table}_fts_map (id, fts_rowid) "
+                     f"SELECT id, rowid FROM {table}_fts")
+
+
+def _migrate_search_index_by_id(conn):
+    # The first index pointed at source rowids, which a VACUUM may renumber
+    # on tables keyed by a TEXT id. Each FTS5 table now keeps its own copy
+    # of the text plus the row's id, and searches join back on that id.
+    for table, columns in SEARCH_SOURCES.items():
+        for trigger in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_fts_{trigger}")
+        conn.execute(f"DROP TABLE IF EXISTS {table}_fts")
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE {table}_fts
+            USING fts5(id UNINDEXED, {", ".join(columns)},
+                       tokenize='porter unicode61')
+        """)
+        for trigger in _id_search_triggers(table, columns):
+            conn.execute(trigger)
+        names = ", ".join(columns)
+        conn.execute(f"INSERT INTO {table}_fts (id, {names}) "
+                     f"SELECT id, {names} FROM {table}")
+
+
+def _migrate_post_image_widths(conn):
+    # {size name: width} of the variants a photo post actually has, for its
+    # srcset. Photos narrower than a size used to be stored at that size
+    # anyway, unscaled; those copies are left out here as they are at upload.
+    from PIL import Image
+
+    conn.execute("ALTER TABLE posts ADD COLUMN image_widths TEXT")
+    rows = conn.execute(
+        "SELECT id, image FROM posts WHERE image LIKE ? AND image LIKE ?",
+        (media.MEDIA_PREFIX + "%", "%" + media.SIZE_PLACEHOLDER + "%")
+    ).fetchall()
+    for post_id, image in rows:
+        widths = {}
+        for size in ("small", "medium", "large"):
+            path = os.path.join(media.STATIC_DIR,
+                                image.replace(media.SIZE_PLACEHOLDER, size))
+            if not os.path.exists(path):
+                continue
+            with Image.open(path) as variant:
+                if widths and variant.width <= max(widths.values()):
+                    break
+                widths[size] = variant.width
+        if widths:
+            conn.execute("UPDATE posts SET image_widths = ? WHERE id = ?",
+                         (json.dumps(widths), post_id))
+
+
+def _migrate_search_index_map(conn):
+    # Deleting or editing a row found its index entry by id, an UNINDEXED
+    # column, which reads the whole FTS table. {table}_fts_map keeps the FTS
+    # rowid of every indexed row under its id.
+    for table, columns in SEARCH_SOURCES.items():
+        for trigger in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_fts_{trigger}")
+        conn.execute(f"""
+            CREATE TABLE {table}_fts_map (
+                id TEXT PRIMARY KEY,
+                fts_rowid INTEGER
+            )
+        """)
+        for trigger in _search_triggers(table, columns):
+            conn.execute(trigger)
+    rebuild_search_index(conn)
+
+
+# Schema migrations in the order they were introduced. PRAGMA user_version
+# records how many have been applied, so only new steps ever run.
+MIGRATIONS = [
+    _migrate_initial_schema,
+    _migrate_unique_site_urls,
+    _migrate_lookup_indexes,
+    _migrate_post_family_code,
+    _migrate_post_counters,
+    _migrate_inline_images_to_media,
+    _migrate_drop_copied_profiles,
+    _migrate_post_image_bytes,
+    _migrate_epoch_timestamps,
+    _migrate_conversations,
+    _migrate_alert_deliveries,
+    _migrate_activity_family_code,
+    _migrate_search_index,
+    _migrate_search_index_by_id,
+    _migrate_post_image_widths,
+    _migrate_search_index_map,
+]
+
+
+def migrate(conn):
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read under the write lock in case another process migrated
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= len(MIGRATIONS):
+                conn.commit()
+                return
+            MIGRATIONS[version](conn)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def check_sqlite_version():
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        required = ".".join(map(str, MIN_SQLITE_VERSION))
+        raise RuntimeError(
+            f"Together needs SQLite {required} or newer, but Python is "
+            f"linked against SQLite {sqlite3.sqlite_version}.")
+
+
+@st.cache_resource
+def get_pool():
+    # Runs once per process: reruns reuse the pool and never touch the schema
+    check_sqlite_version()
+    pool = ConnectionPool(DB_PATH)
+    with pool.connection() as conn:
+        migrate(conn)
+    return pool
+
+
+class RosterCache:
+    # Member rows per family code, shared by every session in the process
+
+    def __init__(self, ttl=ROSTER_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._rosters = {}
+        # Bumped on invalidation so a read that raced with it is not stored
+        self._generations = {}
+
+    def get(self, family_code):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._rosters.get(family_code)
+            if entry and entry[0] > now:
+                return entry[1]
+            generation = self._generations.get(family_code, 0)
+
+        members = query(FAMILY_ROSTER, (family_code, ))
+
+        # Empty rosters are not kept, so mistyped invite codes cost nothing
+        if members:
+            with self._lock:
+                if self._generations.get(family_code, 0) == generation:
+                    self._rosters[family_code] = (now + self.ttl, members)
+        return members
+
+    def invalidate(self, family_code):
+        with self._lock:
+            self._rosters.pop(family_code, None)
+            self._generations[family_code] = (
+                self._generations.get(family_code, 0) + 1)
+
+
+@st.cache_resource
+def get_roster_cache():
+    return RosterCache()
+
+
+def family_roster(family_code):
+    # (name, username, avatar, age, role, bio, id) for each family member
+    return get_roster_cache().get(family_code)
+
+
+def invalidate_roster(family_code):
+    # Call after any write that adds a member or changes a member's profile
+    get_roster_cache().invalidate(family_code)
+
+
+def now_ms():
+    # Value for created_at columns: UTC epoch milliseconds
+    return time.time_ns() // 1_000_000
+
+
+def query(sql, params=()):
+    with get_pool().connection() as conn:
+        cur = conn.cursor()
+        try:
+            return cur.execute(sql, params).fetchall()
+        finally:
+            cur.close()
+
+
+def query_one(sql, params=()):
+    with get_pool().connection() as conn:
+        cur = conn.cursor()
+        try:
+            return cur.execute(sql, params).fetchone()
+        finally:
+            cur.close()
+
+
+@contextmanager
+def transaction():
+    # BEGIN IMMEDIATE takes the write lock up front so concurrent writers
+    # wait on busy_timeout instead of failing on a lock upgrade.
+    with get_pool().connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def execute(sql, params=()):
+    with transaction() as conn:
+        conn.execute(sql, params)
+
+
+class WriteQueue:
+    """Single writer thread that commits queued statements in groups.
+
+    Small, independent writes (likes, moods, locations) share one
+    transaction and one WAL sync instead of paying for their own. Each
+    statement runs in a savepoint, so one that fails is rolled back alone
+    and its caller gets the error; the rest of the group still commits.
+    """
+
+    def __init__(self, pool, window=GROUP_COMMIT_WINDOW,
+                 max_batch=GROUP_COMMIT_MAX):
+        self.pool = pool
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name="together-writer",
+                         daemon=True).start()
+
+    def submit(self, sql, params=()):
+        # The future resolves to the row count once the group has committed
+        future = Future()
+        self._queue.put((sql, params, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _commit(self, batch):
+        outcomes = []
+        try:
+            with self.pool.connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for sql, params, future in batch:
+                    conn.execute("SAVEPOINT queued_write")
+                    try:
+                        outcome = conn.execute(sql, params).rowcount
+                    except sqlite3.Error as e:
+                        conn.execute("ROLLBACK TO queued_write")
+                        outcome = e
+                    conn.execute("RELEASE queued_write")
+                    outcomes.append((future, outcome))
+                conn.commit()
+        except Exception as e:
+            # Nothing in the group was committed
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        for future, outcome in outcomes:
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+
+@st.cache_resource
+def get_writer():
+    return WriteQueue(get_pool())
+
+
+def write(sql, params=()):
+    # Like execute(), but group-committed by the writer thread. Returns the
+    # row count once the write is durable; raises what the statement raised.
+    return get_writer().submit(sql, params).result()
+
+
+def query_plan(conn, sql):
+    # Parameters do not affect the plan, so bind NULL for each placeholder
+    params = (None, ) * sql.count("?")
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def full_scans(conn):
+    # Page queries that read a whole table instead of searching an index.
+    # A full-text MATCH shows as a SCAN of its FTS5 table, which is answered
+    # from the full-text index.
+    scans = {}
+    for name, sql in PAGE_QUERIES.items():
+        steps = [
+            step for step in query_plan(conn, sql)
+            if step.startswith("SCAN") and " USING " not in step
+            and " VIRTUAL TABLE INDEX " not in step
+        ]
+        if steps:
+            scans[name] = steps
+    return scans
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Together database checks")
+    parser.add_argument("database", nargs="?", default=":memory:",
+                        help="database file (default: a fresh in-memory schema)")
+    parser.add_argument("--repair-counters", action="store_true",
+                        help="recompute post like and comment counters")
+    parser.add_argument("--rebuild-search", action="store_true",
+                        help="rebuild the full-text search index")
+    args = parser.parse_args()
+
+    check_sqlite_version()
+    check_conn = sqlite3.connect(args.database, isolation_level=None)
+    migrate(check_conn)
+    if args.repair_counters:
+        check_conn.execute("BEGIN IMMEDIATE")
+        repair_post_counters(check_conn)
+        check_conn.commit()
+        print("Post counters recomputed.")
+        sys.exit(0)
+    if args.rebuild_search:
+        check_conn.execute("BEGIN IMMEDIATE")
+        rebuild_search_index(check_conn)
+        check_conn.commit()
+        print("Search index rebuilt.")
+        sys.exit(0)
+
+    for name, sql in PAGE_QUERIES.items():
+        print(name)
+        for step in query_plan(check_conn, sql):
+            print("   ", step)
+    problems = full_scans(check_conn)
+    if problems:
+        print("Full table scans in:", ", ".join(problems))
+        sys.exit(1)
+    print("All page queries use an index.")
@@ -0,0 +1,170 @@
+"""Uploaded image processing for avatars and photo posts.
+
+Decoding and resizing run in a small process pool so a large photo neither
+holds the GIL for every other session nor grows the server process. One
+decode produces every display size; the variants are stored together and
+the row keeps a single reference with a {size} placeholder (see media.url).
+"""
+import io
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+
+from together import media
+
+# Square edge in pixels for each avatar variant, at 2x the CSS size
+AVATAR_SIZES = {
+    "story": 140,  # .story-avatar ring, 70px
+    "avatar": 72,  # .post-avatar, 36px
+    "full": 300,  # .profile-avatar, 150px
+}
+
+# Width in pixels of each photo post variant; the aspect ratio is kept and
+# nothing is upscaled, so a photo narrower than these gets fewer variants.
+# Posts are at most 500px wide (.app-container).
+PHOTO_WIDTHS = {
+    "small": 320,
+    "medium": 640,
+    "large": 1000,
+}
+
+# Uploads whose header declares more pixels than this are refused before
+# any pixel data is decoded
+MAX_PIXELS = 40_000_000
+
+# Encoder settings by file extension. AVIF is smaller again but slower to
+# encode; builds of Pillow without the chosen encoder fall back to JPEG.
+OUTPUT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 6}),
+    "avif": ("AVIF", {"quality": 60}),
+    "jpg": ("JPEG", {"quality": 85, "optimize": True}),
+}
+IMAGE_FORMAT = "webp"
+
+IMAGE_WORKERS = 2
+# Seconds a submit waits for its image before giving up
+IMAGE_TIMEOUT = 30
+
+
+class ImageRejected(ValueError):
+    """The upload is not an image we can or will process."""
+
+
+@st.cache_resource
+def get_image_pool():
+    # spawn rather than fork: the server process is multi-threaded
+    return ProcessPoolExecutor(max_workers=IMAGE_WORKERS,
+                               mp_context=multiprocessing.get_context("spawn"))
+
+
+def _render_variants(data, sizes, square, image_format):
+    # Runs in a pool worker; returns (extension, {size name: encoded bytes},
+    # {size name: width}). Square variants are centre-cropped; others are
+    # bounded by width, and a size that would come out no wider than the
+    # one below it is left out.
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    too_large = ImageRejected(
+        f"That photo is too large. Please upload one under "
+        f"{MAX_PIXELS // 1_000_000} megapixels.")
+    try:
+        image = Image.open(io.BytesIO(data))
+        if image.width * image.height > MAX_PIXELS:
+            raise too_large
+
+        largest = max(sizes.values())
+        # JPEGs decode straight at 1/2, 1/4 or 1/8 scale, never below the
+        # largest variant; a 12 MP photo never exists in memory at full size
+        image.draft("RGB", (largest, largest))
+        # Decode now, so damaged data is reported here
+        image.load()
+        # Other formats are decoded in full, then cut down by a whole factor
+        # before the expensive LANCZOS pass
+        factor = min(image.size) // (largest * 2)
+        if factor > 1:
+            image = image.reduce(factor)
+        # Phones store portrait shots sideways with an EXIF rotation tag
+        image = ImageOps.exif_transpose(image)
+
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+    except Image.DecompressionBombError:
+        # Pillow's own limit, far above MAX_PIXELS, trips inside open()
+        raise too_large from None
+    except UnidentifiedImageError:
+        raise ImageRejected("That file is not a supported image.") from None
+    except OSError:
+        # Truncated or corrupt image data
+        raise ImageRejected(
+            "That image could not be read. It may be damaged or incomplete."
+        ) from None
+
+    if square:
+        # Crop to a centred square once at the largest size, then step down
+        image = ImageOps.fit(image, (largest, largest),
+                             Image.Resampling.LANCZOS)
+
+    Image.init()
+    if OUTPUT_FORMATS[image_format][0] not in Image.SAVE:
+        image_format = "jpg"
+    pil_format, options = OUTPUT_FORMATS[image_format]
+    variants = {}
+    widths = {}
+    for name, edge in sorted(sizes.items(), key=lambda size: size[1]):
+        if square:
+            resized = image if edge == largest else image.resize(
+                (edge, edge), Image.Resampling.LANCZOS)
+        else:
+            # Very tall photos are also held to twice the width
+            resized = image.copy()
+            resized.thumbnail((edge, edge * 2), Image.Resampling.LANCZOS)
+            if widths and resized.width <= max(widths.values()):
+                break
+        buffer = io.BytesIO()
+        resized.save(buffer, format=pil_format, **options)
+        variants[name] = buffer.getvalue()
+        widths[name] = resized.width
+    return image_format, variants, widths
+
+
+def _process(uploaded_file, sizes, square):
+    try:
+        future = get_image_pool().submit(_render_variants,
+                                         uploaded_file.getvalue(), sizes,
+                                         square, IMAGE_FORMAT)
+        return future.result(timeout=IMAGE_TIMEOUT)
+    except TimeoutError:
+        future.cancel()
+        raise ImageRejected(
+            "That photo took too long to process. Please try a smaller one."
+        ) from None
+    except BrokenProcessPool:
+        # A worker died (out of memory, say) and the pool refuses all further
+        # work; the next upload gets a fresh one
+        get_image_pool.clear()
+        raise ImageRejected(
+            "Something went wrong processing that photo. Please try again."
+        ) from None
+
+
+def process_uploaded_image(uploaded_file):
+    # Avatars. Call only once the form is submitted; raises ImageRejected
+    if uploaded_file is not None:
+        ext, variants, _ = _process(uploaded_file, AVATAR_SIZES, True)
+        return media.store_variants(variants, ext)
+    return None
+
+
+def process_uploaded_photo(uploaded_file):
+    # Photo posts: (reference, bytes of the largest variant, JSON of the
+    # stored {size name: width}) or (None, 0, None). Call only once the form
+    # is submitted; raises ImageRejected
+    if uploaded_file is not None:
+        ext, variants, widths = _process(uploaded_file, PHOTO_WIDTHS, False)
+        largest = max(widths, key=widths.get)
+        return (media.store_variants(variants, ext), len(variants[largest]),
+                json.dumps(widths))
+    return None, 0, None
@@ -0,0 +1,101 @@
+"""In-process pub/sub hub that brings new messages, likes and alerts to
+open sessions. Alerts have their own banner (see together.alerts), which
+this same tick keeps current.
+
+Writers publish an event after their write commits. Each open session runs
+a small fragment every LIVE_INTERVAL seconds that asks the hub for events
+newer than the last one it saw; that is a dict lookup under a lock, so idle
+sessions issue no queries and only the fragment that cares re-renders.
+The hub lives in this server process, so sessions served by another
+process do not see its events.
+"""
+import threading
+from collections import deque
+
+import streamlit as st
+
+# Seconds between an open session's checks of the hub
+LIVE_INTERVAL = 1
+# Events kept per family for sessions that fall behind
+HUB_BACKLOG = 200
+
+
+class Hub:
+    """Per-family event logs plus a version counter per topic."""
+
+    def __init__(self, backlog=HUB_BACKLOG):
+        self.backlog = backlog
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._events = {}
+        self._versions = {}
+
+    def publish(self, family_code, event, topic=None):
+        with self._lock:
+            self._seq += 1
+            log = self._events.get(family_code)
+            if log is None:
+                log = self._events[family_code] = deque(maxlen=self.backlog)
+            log.append((self._seq, event))
+            if topic is not None:
+                self._versions[topic] = self._seq
+
+    def since(self, family_code, seen):
+        # (events after seen, newest sequence number) for one family
+        with self._lock:
+            log = self._events.get(family_code, ())
+            events = [event for seq, event in log if seq > seen]
+            return events, self._seq
+
+    def version(self, topic):
+        # Changes whenever an event is published on topic
+        with self._lock:
+            return self._versions.get(topic, 0)
+
+
+@st.cache_resource
+def get_hub():
+    return Hub()
+
+
+def publish(family_code, kind, topic=None, **data):
+    get_hub().publish(family_code, dict(data, kind=kind), topic)
+
+
+def conversation_topic(conversation_id):
+    return f"conversation:{conversation_id}"
+
+
+@st.fragment(run_every=LIVE_INTERVAL)
+def notifications(user, rerun_on=()):
+    # Toasts for events meant for this viewer. The first run only records
+    # where the log stands, so a new session is not flooded with history.
+    # Events of a kind in rerun_on rerun the whole page instead. This is the
+    # only timer an idle session runs.
+    seen = st.session_state.get('live_seen')
+    events, latest = get_hub().since(st.session_state.family_code,
+                                     seen or 0)
+    st.session_state.live_seen = latest
+    if seen is None:
+        return
+
+    open_conversation = (st.session_state.get('conversation')
+                         if st.session_state.page == "Messages" else None)
+    rerun = False
+    for event in events:
+        if event.get('sender') == user['id']:
+            continue
+        if event['kind'] in rerun_on:
+            rerun = True
+        elif event['kind'] == "message":
+            # The open thread refreshes itself instead
+            if (user['id'] in event['to']
+                    and event['conversation_id'] != open_conversation):
+                st.toast(f"New message from {event['sender_name']}",
+                         icon="💬")
+        elif event['kind'] == "like":
+            if event['post_owner'] == user['id']:
+                st.toast(f"{event['sender_name']} liked your post", icon="❤️")
+
+    if rerun:
+        st.rerun()
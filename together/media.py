@@ -0,0 +1,63 @@
+"""Content-addressed store for uploaded images."""
+import hashlib
+import os
+import uuid
+
+# Files live under static/ next to streamlit_app.py so Streamlit serves them
+# directly (server.enableStaticServing in .streamlit/config.toml).
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(APP_DIR, "static")
+MEDIA_DIR = os.path.join(STATIC_DIR, "media")
+
+# Rows store "media/<sha256>.<ext>" (or "media/<sha256>/{size}.<ext>" for
+# images kept in several sizes) instead of the image bytes
+MEDIA_PREFIX = "media/"
+# Stands for a size name in references to images stored in several sizes
+SIZE_PLACEHOLDER = "{size}"
+STATIC_URL = "app/static/"
+
+
+def _write(directory, name, data):
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        # Write under a temporary name so readers never see a partial file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def store(data, ext):
+    # Identical images hash to the same name and are written once
+    name = f"{hashlib.sha256(data).hexdigest()}.{ext}"
+    _write(MEDIA_DIR, name, data)
+    return MEDIA_PREFIX + name
+
+
+def store_variants(variants, ext):
+    # {size name: bytes} from one upload go in a directory named after the
+    # largest variant; the reference keeps a {size} placeholder for url()
+    largest = max(variants.values(), key=len)
+    directory = hashlib.sha256(largest).hexdigest()
+    for size, data in variants.items():
+        _write(os.path.join(MEDIA_DIR, directory), f"{size}.{ext}", data)
+    return f"{MEDIA_PREFIX}{directory}/{SIZE_PLACEHOLDER}.{ext}"
+
+
+def url(ref, size="full"):
+    # Stored references become static URLs; external URLs pass through.
+    # Single-file references (older uploads) serve the same file at any size.
+    if ref and ref.startswith(MEDIA_PREFIX):
+        return STATIC_URL + ref.replace(SIZE_PLACEHOLDER, size)
+    return ref
+
+
+def srcset(ref, widths):
+    # "<url> 320w, <url> 640w, ..." for images stored in several widths, from
+    # the {size name: width} actually stored; empty for single-file
+    # references, which have only one URL
+    if not (ref and ref.startswith(MEDIA_PREFIX) and SIZE_PLACEHOLDER in ref):
+        return ""
+    return ", ".join(f"{url(ref, size)} {width}w"
+                     for size, width in widths.items())
@@ -0,0 +1,55 @@
+"""Full-text search over posts, journals, books, reviews and chores.
+
+Each kind has its own FTS5 index (see db.SEARCH_SOURCES) and a query that
+applies the viewer's scope: the family for shared things, the author alone
+for journals, and the age groups a child may see for books. The per-kind
+results come back ranked and are merged by rank.
+"""
+import heapq
+import json
+import re
+from itertools import islice
+
+from together import db
+from together.session import has_parental_controls, is_child
+
+
+def match_expression(text):
+    # Every word must match, as a prefix, so "swim less" finds "swimming
+    # lessons". Words are quoted, so nothing typed is read as FTS5 syntax.
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+def hidden_age_groups():
+    if is_child():
+        return ["Teens", "Adults"]
+    if has_parental_controls():
+        return ["Adults"]
+    return []
+
+
+def _scopes(user, family_code):
+    hidden = json.dumps(hidden_age_groups())
+    return {
+        "post": (family_code, ),
+        "journal": (user['id'], ),
+        "book": (family_code, hidden),
+        "book_review": (family_code, hidden),
+        "chore": (family_code, ),
+    }
+
+
+def results(user, family_code, text, limit):
+    # Up to limit (kind, row) results, best first, and whether there are more
+    expression = match_expression(text)
+    if expression is None:
+        return [], False
+    ranked = [
+        [(kind, row) for row in db.query(db.SEARCH_QUERIES[kind],
+                                         (expression, *scope, limit + 1))]
+        for kind, scope in _scopes(user, family_code).items()
+    ]
+    merged = list(islice(heapq.merge(*ranked, key=lambda item: item[1][0]),
+                         limit + 1))
+    return merged[:limit], len(merged) > limit
@@ -0,0 +1,44 @@
+"""Session state helpers shared by the entry script and the pages."""
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import streamlit as st
+
+
+def check_login():
+    return st.session_state.get('current_user') is not None
+
+
+def is_child():
+    user = st.session_state.get('current_user')
+    return user and user['age'] < 13
+
+
+def has_parental_controls():
+    user = st.session_state.get('current_user')
+    return user and (user.get('parental_controls', False) or user['age'] < 13)
+
+
+def go_to_page(page):
+    st.session_state.page = page
+    # Keep the address bar bookmarkable; this does not reload the page
+    st.query_params["page"] = page
+
+
+def viewer_timezone():
+    # The browser reports its IANA zone; fall back to UTC without one
+    try:
+        return ZoneInfo(st.context.timezone)
+    except (TypeError, ValueError, ZoneInfoNotFoundError):
+        return timezone.utc
+
+
+def viewer_timezone_name():
+    # What local_time() depends on, for use in cache keys
+    return st.context.timezone
+
+
+def local_time(created_at):
+    # created_at columns hold UTC epoch milliseconds
+    when = datetime.fromtimestamp(created_at / 1000, viewer_timezone())
+    return when.strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,54 @@
+"""Static page markup: the stylesheet link and the fixed HTML blocks.
+
+Only the stylesheet tag is computed (its content hash, once per process);
+the blocks are plain constants kept here to keep the pages readable, and
+are sent in full whenever they are rendered.
+"""
+import functools
+import hashlib
+import os
+
+from together import media
+
+STYLESHEET = "together.css"
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet_tag():
+    # The content hash in the URL lets browsers keep the file cached until
+    # it actually changes. Needs Streamlit 1.57+ (see requirements.txt):
+    # older servers send .css from app/static as text/plain with nosniff,
+    # and browsers refuse it as a stylesheet.
+    with open(os.path.join(media.STATIC_DIR, STYLESHEET), "rb") as f:
+        version = hashlib.sha256(f.read()).hexdigest()[:12]
+    return (f'<style>@import url("{media.STATIC_URL}{STYLESHEET}'
+            f'?v={version}");</style>')
+
+
+WELCOME_HTML = """
+<div class="welcome-screen">
+    <div class="welcome-content">
+        <div class="app-logo">Together</div>
+        <div class="app-tagline">Where Families Connect</div>
+        <div class="app-description">
+            A safe, private social space designed for families to share moments,
+            stay connected, and grow together with smart parental controls.
+        </div>
+    </div>
+</div>
+"""
+
+AUTH_HEADER_HTML = """
+<div class="auth-container">
+    <div class="auth-header">
+        <div class="auth-title">Welcome to Together</div>
+        <div class="auth-subtitle">Choose how you'd like to join your family</div>
+    </div>
+</div>
+"""
+
+PARENTAL_CONTROLS_HTML = """
+<div class="parental-controls">
+    🛡️ Parental Controls Active - Safe & Secure Experience
+</div>
+"""
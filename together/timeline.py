@@ -0,0 +1,41 @@
+"""The family's "what's new" timeline across every kind of activity.
+
+Each kind (posts, moods, chores, ...) is a generator that reads its own
+table a keyset page at a time, newest first; heapq.merge interleaves them
+lazily by (created_at, id). A timeline page therefore reads at most one
+page from each table, and a table is only read again once the rows already
+fetched from it have all been shown.
+"""
+import heapq
+from itertools import islice
+
+from together import db
+
+
+def _stream(kind, family_code, cursor, page_size):
+    # (kind, row) for one kind of activity, newest first, after cursor
+    sql = db.TIMELINE_PAGES[kind]
+    while True:
+        rows = db.query(sql, (family_code, *cursor, page_size))
+        for row in rows:
+            yield kind, row
+        if len(rows) < page_size:
+            return
+        cursor = (rows[-1][0], rows[-1][1])
+
+
+def page(family_code, cursor=db.TIMELINE_HEAD, size=20):
+    # (items, cursor of the next page or None). Ids are unique across the
+    # tables, so one (created_at, id) cursor continues every stream at once.
+    streams = [
+        _stream(kind, family_code, cursor, size + 1)
+        for kind in db.TIMELINE_PAGES
+    ]
+    merged = heapq.merge(*streams,
+                         key=lambda item: (item[1][0], item[1][1]),
+                         reverse=True)
+    items = list(islice(merged, size + 1))
+    if len(items) <= size:
+        return items, None
+    items = items[:size]
+    return items, (items[-1][1][0], items[-1][1][1])
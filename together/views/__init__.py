@@ -0,0 +1,21 @@
+"""One module per page, each exposing render(user)."""
+import importlib
+
+# Page name -> module under together.views
+PAGES = {
+    "Feed": "feed",
+    "Activity": "activity",
+    "Learning": "learning",
+    "Browser": "browser",
+    "Chores": "chores",
+    "Mood": "mood",
+    "Messages": "messages",
+    "Family": "family",
+}
+
+
+def render(page, user):
+    # Only the active page's module is imported, so a rerun never loads or
+    # runs code for pages the user is not looking at
+    module = importlib.import_module(f"{__name__}.{PAGES[page]}")
+    module.render(user)
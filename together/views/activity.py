@@ -0,0 +1,76 @@
+"""Activity page: family search and the merged timeline of everything new."""
+import streamlit as st
+
+from together import cards, db, search, timeline
+
+# Timeline entries shown per "Load more" click
+ACTIVITY_PAGE_SIZE = 20
+# Search results shown per "More results" click
+SEARCH_PAGE_SIZE = 20
+
+
+def load_more():
+    st.session_state.activity_pages += 1
+
+
+def more_results():
+    st.session_state.search_pages += 1
+
+
+def new_search():
+    st.session_state.search_pages = 1
+
+
+def render_results(user, text):
+    limit = SEARCH_PAGE_SIZE * st.session_state.search_pages
+    found, has_more = search.results(user, st.session_state.family_code, text,
+                                     limit)
+    if not found:
+        st.info("No matches.")
+    for kind, row in found:
+        st.markdown(cards.search_result(kind, row), unsafe_allow_html=True)
+    if has_more:
+        st.button("More results", key="search_more",
+                  use_container_width=True, on_click=more_results)
+
+
+def render(user):
+    if 'activity_pages' not in st.session_state:
+        st.session_state.activity_pages = 1
+    if 'search_pages' not in st.session_state:
+        st.session_state.search_pages = 1
+
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    text = st.text_input("Search",
+                         key="search_text",
+                         placeholder="🔍 Search posts, books, chores...",
+                         label_visibility="collapsed",
+                         on_change=new_search)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    if text.strip():
+        render_results(user, text)
+        return
+
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown('<div class="form-title">✨ What\'s New</div>',
+                unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    items = []
+    cursor = db.TIMELINE_HEAD
+    for _ in range(st.session_state.activity_pages):
+        page, cursor = timeline.page(st.session_state.family_code, cursor,
+                                     ACTIVITY_PAGE_SIZE)
+        items.extend(page)
+        if cursor is None:
+            break
+
+    if not items:
+        st.info("Nothing new yet. Share a post or a mood to get started!")
+    for kind, row in items:
+        st.markdown(cards.activity(kind, row), unsafe_allow_html=True)
+
+    if cursor is not None:
+        st.button("Load more", key="activity_load_more",
+                  use_container_width=True, on_click=load_more)
@@ -0,0 +1,73 @@
+"""Browser page: the family's list of safe sites."""
+import sqlite3
+import uuid
+
+import streamlit as st
+
+from together import db
+
+
+def render(user):
+    st.markdown("""
+    <div class="browser-container">
+        <div class="browser-header">
+            <h2>🌐 Safe Family Browser</h2>
+            <p>Explore approved websites safely with parental controls</p>
+        </div>
+    </div>
+    """,
+                unsafe_allow_html=True)
+
+    # Get approved safe sites
+    safe_sites = db.query(db.SAFE_SITES)
+
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown('<div class="form-title">Choose a website to visit:</div>',
+                unsafe_allow_html=True)
+
+    for site in safe_sites:
+        st.markdown(f'''
+        <div class="safe-site">
+            <div class="site-info">
+                <h4>{site[1]}</h4>
+                <p>{site[3]}</p>
+            </div>
+        </div>
+        ''',
+                    unsafe_allow_html=True)
+
+        col1, col2 = st.columns([4, 1])
+        with col2:
+            if st.button("Visit", key=f"visit_{site[0]}"):
+                st.markdown(f'''
+                <iframe src="{site[2]}" width="100%" height="600" 
+                        style="border: 2px solid #dbdbdb; border-radius: 12px; margin-top: 16px;">
+                </iframe>
+                ''',
+                            unsafe_allow_html=True)
+
+    # Allow parents to add new safe sites
+    if user['role'] == 'parent':
+        st.markdown(
+            '<div class="form-title">Add New Safe Site (Parents Only)</div>',
+            unsafe_allow_html=True)
+        with st.form("add_safe_site"):
+            site_name = st.text_input("Website Name")
+            site_url = st.text_input("Website URL", placeholder="https://...")
+            site_description = st.text_input("Description")
+
+            if st.form_submit_button("Add Safe Site"):
+                if site_name and site_url and site_description:
+                    site_id = str(uuid.uuid4())
+                    try:
+                        db.execute(
+                            "INSERT INTO safe_sites VALUES (?, ?, ?, ?, ?, ?)",
+                            (site_id, site_name,
+                             site_url, site_description, user['username'],
+                             db.now_ms()))
+                        st.success("Safe site added!")
+                        st.rerun()
+                    except sqlite3.IntegrityError:
+                        st.error("That website is already on the safe list.")
+
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,74 @@
+"""Chores page: assigning and completing family chores."""
+import uuid
+
+import streamlit as st
+
+from together import cards, db
+
+
+def complete_chore(chore_id):
+    db.write("UPDATE chores SET status = 'Completed' WHERE id = ?",
+             (chore_id, ))
+    st.session_state[f"completed_{chore_id}"] = True
+
+
+# Completing a chore reruns only its card, not the chore list query
+@st.fragment
+def chore_card(chore, user):
+    status = chore[4]
+    # Left by complete_chore when this card reruns on its own after a click
+    just_completed = st.session_state.pop(f"completed_{chore[0]}", False)
+    if just_completed:
+        status = "Completed"
+    is_assigned_to_user = chore[2] == user['username']
+    can_complete = is_assigned_to_user or user['role'] == 'parent'
+
+    st.markdown(cards.chore(chore, status), unsafe_allow_html=True)
+
+    if just_completed:
+        st.success(f"🎉 Great job! You earned {chore[3]} stars!")
+    elif status == "Pending" and can_complete:
+        col1, col2, col3 = st.columns([1, 1, 2])
+        with col1:
+            st.button("✅ Complete",
+                      key=f"complete_{chore[0]}",
+                      on_click=complete_chore,
+                      args=(chore[0], ))
+
+
+def render(user):
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown('<div class="form-title">✅ Family Chores</div>',
+                unsafe_allow_html=True)
+
+    # Parents can add chores, everyone can see them
+    if user['role'] == 'parent':
+        with st.form("add_chore"):
+            task = st.text_input("Chore Description",
+                                 placeholder="Take out trash, clean room...")
+            family_members = db.family_roster(st.session_state.family_code)
+            assigned_to = st.selectbox(
+                "Assign To", [member[1] for member in family_members])
+            reward = st.slider("Reward Stars", 1, 10, 5)
+
+            if st.form_submit_button("Add Chore", use_container_width=True):
+                if task:
+                    chore_id = str(uuid.uuid4())
+                    db.execute(
+                        """INSERT INTO chores
+                           (id, task, assigned_to, reward, status, added_by,
+                            created_at, family_code)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                        (chore_id, task,
+                         assigned_to, reward, "Pending", user['username'],
+                         db.now_ms(), st.session_state.family_code))
+                    st.success("Chore assigned! 🎯")
+                    st.rerun()
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Display chores
+    chores = db.query(db.FAMILY_CHORES, (st.session_state.family_code, ))
+
+    for chore in chores:
+        chore_card(chore, user)
@@ -0,0 +1,165 @@
+"""Family page: profile, members, locations, books, achievements and alerts."""
+import uuid
+
+import streamlit as st
+
+from together import alerts, cards, db, media
+from together.images import ImageRejected, process_uploaded_image
+
+
+def render(user):
+    # Profile section
+    st.markdown(f'''
+    <div class="profile-header">
+        <img src="{media.url(user['avatar'])}" class="profile-avatar">
+        <div class="profile-name">{user['name']}</div>
+        <div class="profile-username">@{user['username']}</div>
+        <div class="profile-bio">{user['bio'] if user['bio'] else 'No bio yet'}</div>
+        <div class="profile-stats">
+            <span>Age: {user['age']}</span>
+            <span>Role: {user['role'].title()}</span>
+            {f"<span>Linked to: {user['linked_parent']}</span>" if user.get('linked_parent') else ""}
+        </div>
+    </div>
+    ''',
+                unsafe_allow_html=True)
+
+    # Update profile picture
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown('<div class="form-title">Update Profile Picture</div>',
+                unsafe_allow_html=True)
+    uploaded_file = st.file_uploader("Upload new profile picture",
+                                     type=['png', 'jpg', 'jpeg'],
+                                     key="profile_update")
+    if uploaded_file:
+        if st.button("Update Picture", use_container_width=True):
+            try:
+                new_avatar = process_uploaded_image(uploaded_file)
+            except ImageRejected as e:
+                st.error(str(e))
+            else:
+                db.execute("UPDATE users SET avatar = ? WHERE id = ?",
+                           (new_avatar, user['id']))
+                db.invalidate_roster(st.session_state.family_code)
+                st.session_state.current_user['avatar'] = new_avatar
+                st.success("Profile picture updated! 📸")
+                st.rerun()
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Family members
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown('<div class="form-title">👨‍👩‍👧‍👦 Family Members</div>',
+                unsafe_allow_html=True)
+    family_members = db.family_roster(st.session_state.family_code)
+
+    for member in family_members:
+        st.markdown(f'''
+        <div class="post">
+            <div class="post-header">
+                <div class="post-user-info">
+                    <img src="{media.url(member[2], "avatar")}" class="post-avatar">
+                    <div>
+                        <div class="post-username">{member[0]} (@{member[1]})</div>
+                        <div class="post-location">Age {member[3]} • {member[4].title()}</div>
+                    </div>
+                </div>
+            </div>
+            {f'<div class="post-content">{member[5]}</div>' if member[5] else ''}
+        </div>
+        ''',
+                    unsafe_allow_html=True)
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Location sharing
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown('<div class="form-title">📍 Family Locations</div>',
+                unsafe_allow_html=True)
+
+    with st.form("share_location"):
+        location_name = st.text_input(
+            "Location Name", placeholder="Home, School, Work, Park...")
+        location_notes = st.text_area("Notes (optional)",
+                                      placeholder="What are you doing here?")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            latitude = st.number_input("Latitude",
+                                       value=40.7128,
+                                       format="%.4f")
+        with col2:
+            longitude = st.number_input("Longitude",
+                                        value=-74.0060,
+                                        format="%.4f")
+
+        if st.form_submit_button("Share Location", use_container_width=True):
+            if location_name:
+                location_id = str(uuid.uuid4())
+                db.write(
+                    """INSERT INTO locations
+                       (id, user_id, location_name, latitude, longitude,
+                        notes, created_at, family_code)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (location_id, user['id'],
+                     location_name, latitude, longitude, location_notes,
+                     db.now_ms(), st.session_state.family_code))
+                st.success("Location shared with family! 📍")
+                st.rerun()
+
+    # Display family locations
+    locations = db.query(db.FAMILY_LOCATIONS, (st.session_state.family_code, ))
+
+    for location in locations:
+        st.markdown(cards.location(location), unsafe_allow_html=True)
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Additional features - Available to everyone but some with restrictions
+    with st.expander("📚 Family Library"):
+        # Anyone can add books, but parents can control access
+        with st.form("add_book"):
+            title = st.text_input("Book Title")
+            author = st.text_input("Author")
+            url = st.text_input("URL (optional)")
+            age_group = st.selectbox("Appropriate For",
+                                     ["Kids", "Teens", "Adults", "Everyone"])
+
+            if st.form_submit_button("Add Book"):
+                if title and author:
+                    book_id = str(uuid.uuid4())
+                    db.execute("INSERT INTO books VALUES (?, ?, ?, ?, ?, ?)",
+                               (book_id, title, author, url, user['username'],
+                                age_group))
+                    st.success("Book added to family library! 📚")
+
+    with st.expander("🏆 Achievements"):
+        with st.form("add_achievement"):
+            title = st.text_input("Achievement Title")
+            description = st.text_area("Description")
+
+            if st.form_submit_button("Add Achievement"):
+                if title and description:
+                    ach_id = str(uuid.uuid4())
+                    db.execute(
+                        """INSERT INTO achievements
+                           (id, user_id, title, description, created_at,
+                            family_code)
+                           VALUES (?, ?, ?, ?, ?, ?)""",
+                        (ach_id, user['id'], title, description,
+                         db.now_ms(), st.session_state.family_code))
+                    st.success("Achievement added! 🏆")
+
+    # Only parents can send emergency alerts
+    if user['role'] == 'parent':
+        with st.expander("🚨 Emergency Alert (Parents Only)"):
+            st.warning("⚠️ Use only for real emergencies!")
+            emergency_msg = st.text_area("Emergency Message")
+            if st.button("🚨 Send Alert") and emergency_msg:
+                recipients = alerts.send(user, st.session_state.family_code,
+                                         emergency_msg)
+                if recipients:
+                    st.error(f"Emergency alert sent to {recipients} family "
+                             f"member{'s' if recipients > 1 else ''}!")
+                else:
+                    st.info("Nobody else has joined the family yet.")
+            alerts.delivery_status(st.session_state.family_code)
@@ -0,0 +1,149 @@
+"""Feed page: family stories, new posts and the paginated post list."""
+import uuid
+
+import streamlit as st
+
+from together import cards, db, live, media
+from together.images import ImageRejected, process_uploaded_photo
+
+# Posts fetched per feed page
+FEED_PAGE_SIZE = 20
+# A page also ends once its photos add up to this many bytes; the rest of
+# the posts start the next page
+FEED_PAGE_IMAGE_BYTES = 2 * 1024 * 1024
+
+
+def _within_image_budget(page):
+    # How many posts of the page fit in the budget; always at least one
+    total = 0
+    for shown, post in enumerate(page):
+        total += post[11]
+        if total > FEED_PAGE_IMAGE_BYTES and shown:
+            return shown
+    return len(page)
+
+
+def toggle_like(post_id, post_owner, user, liked):
+    user_id = user['id']
+    if not liked:
+        like_id = str(uuid.uuid4())
+        db.write("INSERT OR IGNORE INTO post_likes VALUES (?, ?, ?)",
+                 (like_id, post_id, user_id))
+        live.publish(st.session_state.family_code, "like",
+                     post_id=post_id, post_owner=post_owner,
+                     sender=user_id, sender_name=user['username'])
+    else:
+        db.write("DELETE FROM post_likes WHERE post_id = ? AND user_id = ?",
+                 (post_id, user_id))
+    st.session_state[f"likes_{post_id}"] = db.query_one(
+        db.POST_LIKES, (user_id, post_id))
+
+
+# A like reruns only this card and its one-row POST_LIKES read, not the
+# whole feed
+@st.fragment
+def post_card(post, user):
+    like_count = post[8]
+    user_liked = bool(post[9])
+    # Left by toggle_like when this card reruns on its own after a click
+    fresh = st.session_state.pop(f"likes_{post[0]}", None)
+    if fresh:
+        like_count, user_liked = fresh[0], bool(fresh[1])
+
+    st.markdown(cards.post(post, like_count, user_liked),
+                unsafe_allow_html=True)
+
+    # Like functionality
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 5])
+    with col1:
+        st.button("❤️" if not user_liked else "💔",
+                  key=f"like_{post[0]}",
+                  on_click=toggle_like,
+                  args=(post[0], post[1], user, user_liked))
+
+
+def render(user):
+    # Stories Section
+    family_users = db.family_roster(st.session_state.family_code)
+
+    if family_users:
+        stories_html = '<div class="stories-container">'
+        for user_data in family_users:
+            stories_html += f'''
+            <div class="story-item">
+                <img src="{media.url(user_data[2], "story")}" class="story-avatar">
+                <div class="story-username">{user_data[1]}</div>
+            </div>
+            '''
+        stories_html += '</div>'
+        st.markdown(stories_html, unsafe_allow_html=True)
+
+    # Create Post
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="form-title">Share a moment with your family</div>',
+        unsafe_allow_html=True)
+
+    with st.form("create_post", clear_on_submit=True):
+        post_content = st.text_area(
+            "What's happening?",
+            placeholder="Share your day with the family...",
+            height=100)
+        post_location = st.text_input("Location (optional)",
+                                      placeholder="Where are you?")
+        post_photo = st.file_uploader("Add a photo (optional)",
+                                      type=['png', 'jpg', 'jpeg'],
+                                      key="post_photo")
+
+        col1, col2 = st.columns([3, 1])
+        with col2:
+            shared = st.form_submit_button("Share", use_container_width=True)
+        if shared and (post_content or post_photo):
+            try:
+                # Decoded and resized only now that the post is submitted
+                image, image_bytes, image_widths = process_uploaded_photo(
+                    post_photo)
+            except ImageRejected as e:
+                st.error(str(e))
+            else:
+                post_id = str(uuid.uuid4())
+                db.execute(
+                    """INSERT INTO posts
+                       (id, user_id, content, image, location, created_at,
+                        family_code, image_bytes, image_widths)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (post_id, user['id'], post_content, image or "",
+                     post_location,
+                     db.now_ms(),
+                     st.session_state.family_code, image_bytes,
+                     image_widths))
+                st.rerun()
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Display Posts, one keyset page per "Load more" click. Each page is an
+    # index range read, so cost tracks what was loaded, not family history.
+    posts = []
+    cursor = db.FEED_HEAD
+    for _ in range(st.session_state.feed_pages):
+        page = db.query(db.FEED_PAGE,
+                        (user['id'], st.session_state.family_code, *cursor,
+                         FEED_PAGE_SIZE + 1))
+        has_more = len(page) > FEED_PAGE_SIZE
+        page = page[:FEED_PAGE_SIZE]
+        shown = _within_image_budget(page)
+        if shown < len(page):
+            page, has_more = page[:shown], True
+        posts.extend(page)
+        if not has_more:
+            break
+        cursor = (posts[-1][7], posts[-1][0])
+
+    for post in posts:
+        post_card(post, user)
+
+    if has_more:
+        if st.button("Load more posts", key="feed_load_more",
+                     use_container_width=True):
+            st.session_state.feed_pages += 1
+            st.rerun()
@@ -0,0 +1,65 @@
+"""Learning page: logging what was learned and the learning history."""
+import uuid
+
+import streamlit as st
+
+from together import db, media
+from together.session import local_time
+
+
+def render(user):
+    st.markdown("""
+    <div class="learning-card">
+        <h2>🧠 Learning Hub</h2>
+        <p>Track your learning progress and earn stars!</p>
+    </div>
+    """,
+                unsafe_allow_html=True)
+
+    # Add learning activity
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown('<div class="form-title">What did you learn today?</div>',
+                unsafe_allow_html=True)
+
+    with st.form("add_learning"):
+        topic = st.text_input("Learning Topic",
+                              placeholder="Math, Reading, Science, Art...")
+        score = st.selectbox("How did you do?", [
+            "⭐ Good try!", "⭐⭐ Pretty good!", "⭐⭐⭐ Great job!",
+            "⭐⭐⭐⭐ Amazing!", "⭐⭐⭐⭐⭐ Perfect!"
+        ])
+
+        if st.form_submit_button("Save Learning Progress",
+                                 use_container_width=True):
+            if topic:
+                learning_id = str(uuid.uuid4())
+                db.write(
+                    """INSERT INTO learning
+                       (id, user_id, topic, score, created_at, family_code)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    (learning_id, user['id'], topic, score, db.now_ms(),
+                     st.session_state.family_code))
+                st.success("🎉 Great job learning! Keep it up!")
+                st.rerun()
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Display learning history
+    learning_records = db.query(db.LEARNING_HISTORY, (user['id'], ))
+
+    for record in learning_records:
+        st.markdown(f'''
+        <div class="post">
+            <div class="post-header">
+                <div class="post-user-info">
+                    <img src="{media.url(user['avatar'], "avatar")}" class="post-avatar">
+                    <div>
+                        <div class="post-username">📚 {record[2]}</div>
+                        <div class="post-location" style="font-size: 18px;">{record[3]}</div>
+                    </div>
+                </div>
+            </div>
+            <div class="post-timestamp">{local_time(record[4])}</div>
+        </div>
+        ''',
+                    unsafe_allow_html=True)
@@ -0,0 +1,157 @@
+"""Messages page: the inbox and private threads between family members."""
+import uuid
+
+import streamlit as st
+
+from together import cards, db, live
+
+# Conversations listed in the inbox
+INBOX_SIZE = 50
+# Messages fetched per thread page
+THREAD_PAGE_SIZE = 30
+
+
+def open_conversation(conversation_id, user_id):
+    st.session_state.conversation = conversation_id
+    st.session_state.thread_pages = 1
+    mark_read(conversation_id, user_id)
+
+
+def mark_read(conversation_id, user_id):
+    db.write(
+        """UPDATE conversation_members SET unread_count = 0
+           WHERE conversation_id = ? AND user_id = ? AND unread_count > 0""",
+        (conversation_id, user_id))
+
+
+def close_conversation():
+    st.session_state.conversation = None
+
+
+def start_conversation(user, other):
+    # The single thread between two members, created on first use
+    pair_key = ":".join(sorted((user['id'], other[6])))
+    row = db.query_one(db.CONVERSATION_BY_PAIR, (pair_key, ))
+    if row is None:
+        conversation_id = str(uuid.uuid4())
+        with db.transaction() as conn:
+            conn.execute(
+                """INSERT OR IGNORE INTO conversations
+                   (id, family_code, pair_key, created_at)
+                   VALUES (?, ?, ?, ?)""",
+                (conversation_id, st.session_state.family_code, pair_key,
+                 db.now_ms()))
+            # Someone else may have created it first
+            conversation_id = conn.execute(db.CONVERSATION_BY_PAIR,
+                                           (pair_key, )).fetchone()[0]
+            conn.executemany(
+                """INSERT OR IGNORE INTO conversation_members
+                   (conversation_id, user_id) VALUES (?, ?)""",
+                [(conversation_id, user['id']), (conversation_id, other[6])])
+        row = (conversation_id, )
+    open_conversation(row[0], user['id'])
+
+
+def render_inbox(user):
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown('<div class="form-title">💬 New Message</div>',
+                unsafe_allow_html=True)
+    others = [member for member in db.family_roster(st.session_state.family_code)
+              if member[6] != user['id']]
+    if others:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            other = st.selectbox("To", others, format_func=lambda m: m[0])
+        with col2:
+            st.button("Start",
+                      key="start_conversation",
+                      use_container_width=True,
+                      on_click=start_conversation,
+                      args=(user, other))
+    else:
+        st.info("Invite your family to start messaging.")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    conversations = db.query(db.INBOX, (user['id'], INBOX_SIZE))
+    if not conversations:
+        st.info("No messages yet.")
+    for conversation in conversations:
+        st.markdown(cards.conversation(conversation, user['id']),
+                    unsafe_allow_html=True)
+        st.button("Open",
+                  key=f"open_{conversation[0]}",
+                  on_click=open_conversation,
+                  args=(conversation[0], user['id']))
+
+
+def load_older():
+    st.session_state.thread_pages += 1
+
+
+# Re-checks the hub every LIVE_INTERVAL; the thread is only read again when
+# something was posted to it, so an idle open thread issues no queries
+@st.fragment(run_every=live.LIVE_INTERVAL)
+def thread_messages(user, conversation_id):
+    version = live.get_hub().version(live.conversation_topic(conversation_id))
+    state = (conversation_id, st.session_state.thread_pages, version)
+    cached = st.session_state.get('thread_cache')
+    if cached is None or cached[0] != state:
+        if cached is not None and cached[0][:2] == state[:2]:
+            # New messages arrived while the thread was open
+            mark_read(conversation_id, user['id'])
+
+        # Newest pages first, shown oldest at the top
+        messages = []
+        cursor = db.THREAD_HEAD
+        for _ in range(st.session_state.thread_pages):
+            page = db.query(db.THREAD_PAGE,
+                            (conversation_id, *cursor, THREAD_PAGE_SIZE + 1))
+            has_more = len(page) > THREAD_PAGE_SIZE
+            messages.extend(page[:THREAD_PAGE_SIZE])
+            if not has_more:
+                break
+            cursor = (messages[-1][5], messages[-1][0])
+        cached = st.session_state.thread_cache = (state, messages, has_more)
+
+    _, messages, has_more = cached
+    if has_more:
+        st.button("Load older messages", key="thread_load_more",
+                  use_container_width=True, on_click=load_older)
+
+    for message in reversed(messages):
+        st.markdown(cards.message(message, message[1] == user['id']),
+                    unsafe_allow_html=True)
+
+
+def render_thread(user, conversation_id):
+    st.button("← Inbox", key="close_conversation", on_click=close_conversation)
+
+    thread_messages(user, conversation_id)
+
+    with st.form("send_message", clear_on_submit=True):
+        text = st.text_area("Message", placeholder="Write a message...",
+                            height=80)
+        if st.form_submit_button("Send", use_container_width=True) and text:
+            message_id = str(uuid.uuid4())
+            db.write(
+                """INSERT INTO messages
+                   (id, sender, message, created_at, conversation_id)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (message_id, user['id'], text, db.now_ms(), conversation_id))
+            members = db.query(db.CONVERSATION_MEMBERS, (conversation_id, ))
+            live.publish(st.session_state.family_code, "message",
+                         topic=live.conversation_topic(conversation_id),
+                         message_id=message_id,
+                         conversation_id=conversation_id,
+                         to=[member[0] for member in members],
+                         sender=user['id'], sender_name=user['username'])
+            # Replying means the thread has been read
+            mark_read(conversation_id, user['id'])
+            st.rerun()
+
+
+def render(user):
+    if st.session_state.get('conversation'):
+        render_thread(user, st.session_state.conversation)
+    else:
+        render_inbox(user)
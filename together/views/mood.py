@@ -0,0 +1,71 @@
+"""Mood page: mood check-ins, the family mood board and the journal."""
+import uuid
+
+import streamlit as st
+
+from together import cards, db
+
+
+# Sharing a mood reruns only the check-in and the board below it, which
+# already reads after the insert, so no full rerun is needed
+@st.fragment
+def mood_board(user):
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown('<div class="form-title">😊 How are you feeling today?</div>',
+                unsafe_allow_html=True)
+
+    mood_options = [
+        "😊 Happy", "😐 Okay", "😢 Sad", "😠 Angry", "🤩 Excited", "😴 Tired",
+        "😟 Worried", "🥰 Loved", "😎 Cool", "🤔 Thoughtful"
+    ]
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selected_mood = st.selectbox("Choose your mood", mood_options)
+    with col2:
+        if st.button("Share Mood", use_container_width=True):
+            mood_id = str(uuid.uuid4())
+            db.write(
+                """INSERT INTO moods (id, user_id, mood, created_at, family_code)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (mood_id, user['id'], selected_mood, db.now_ms(),
+                 st.session_state.family_code))
+            st.success("Mood shared with your family! 💕")
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Family mood board
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown('<div class="form-title">Family Mood Board</div>',
+                unsafe_allow_html=True)
+
+    moods = db.query(db.FAMILY_MOODS, (st.session_state.family_code, ))
+
+    for mood in moods:
+        st.markdown(cards.mood(mood), unsafe_allow_html=True)
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render(user):
+    mood_board(user)
+
+    # Private journal (only if not restricted by parental controls or parent allows)
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown('<div class="form-title">📓 Private Journal</div>',
+                unsafe_allow_html=True)
+
+    journal_entry = st.text_area(
+        "Write your thoughts (private)...",
+        height=150,
+        placeholder="How was your day? What are you thinking about?")
+    if st.button("Save Journal Entry",
+                 use_container_width=True) and journal_entry:
+        journal_id = str(uuid.uuid4())
+        db.execute("INSERT INTO journals VALUES (?, ?, ?, ?)",
+                   (journal_id, user['id'], journal_entry,
+                    db.now_ms()))
+        st.success("Journal saved privately! 📝")
+        st.rerun()
+
+    st.markdown('</div>', unsafe_allow_html=True)